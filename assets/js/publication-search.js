@@ -0,0 +1,172 @@
+// Filters the publication list with the index written by
+// scripts/sync_cv_and_publications.py into assets/json/publication-search/.
+// index.json is fetched when the filter is first focused and shards when a
+// query needs them. Every query token must match (the last one as a prefix,
+// for search-as-you-type); "author:", "title:", "venue:" or "year:" limits a
+// term to one field.
+(function () {
+  "use strict";
+
+  const form = document.querySelector("[data-publication-search]");
+  if (!form || !window.fetch) {
+    return;
+  }
+  const base = form.getAttribute("data-publication-search");
+  const input = form.querySelector("input");
+  const status = form.querySelector("[data-publication-search-status]");
+  const items = Array.from(document.querySelectorAll("[data-publication-key]"));
+  const lists = Array.from(new Set(items.map((item) => item.parentElement)));
+  const shards = new Map();
+  let manifest = null;
+  let generation = 0;
+
+  function load(name) {
+    return fetch(base + name).then((response) => {
+      if (!response.ok) {
+        throw new Error(`${name}: HTTP ${response.status}`);
+      }
+      return response.json();
+    });
+  }
+
+  function loadManifest() {
+    if (!manifest) {
+      manifest = load("index.json").then(
+        (index) => {
+          index.stopwordSet = new Set(index.stopwords);
+          return index;
+        },
+        (error) => {
+          // Retry on the next query instead of caching the failure.
+          manifest = null;
+          throw error;
+        }
+      );
+    }
+    return manifest;
+  }
+
+  function loadShard(index, token) {
+    const name = index.shards[token.charAt(0)] || index.shards[""];
+    if (!name) {
+      return Promise.resolve(null);
+    }
+    if (!shards.has(name)) {
+      // Tokens are sorted so prefix lookups can binary search.
+      const shard = load(name).then((postings) => ({ postings, tokens: Object.keys(postings).sort() }));
+      shards.set(name, shard);
+      shard.catch(() => shards.delete(name));
+    }
+    return shards.get(name);
+  }
+
+  // Must match tokenize() in scripts/site_sync/searchindex.py.
+  function tokenize(index, text) {
+    return text
+      .normalize("NFKD")
+      .replace(/[\u0300-\u036f]/g, "")
+      .toLowerCase()
+      .split(/[^a-z0-9]+/)
+      .filter((token) => token && !index.stopwordSet.has(token));
+  }
+
+  function parseQuery(index, query) {
+    const terms = [];
+    for (const word of query.trim().split(/\s+/)) {
+      const match = /^(\w+):(.*)$/.exec(word);
+      const field = match ? index.fields.indexOf(match[1].toLowerCase()) : -1;
+      const mask = field >= 0 ? 1 << field : -1;
+      for (const token of tokenize(index, field >= 0 ? match[2] : word)) {
+        terms.push({ token, mask, prefix: false });
+      }
+    }
+    if (terms.length && !/\s$/.test(query)) {
+      terms[terms.length - 1].prefix = true;
+    }
+    return terms;
+  }
+
+  function lowerBound(tokens, token) {
+    let low = 0;
+    let high = tokens.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (tokens[middle] < token) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low;
+  }
+
+  function matchTerm(shard, term) {
+    const docs = new Set();
+    if (!shard) {
+      return docs;
+    }
+    const collect = (postings) => {
+      for (let i = 0; i < postings.length; i += 2) {
+        if (postings[i + 1] & term.mask) {
+          docs.add(postings[i]);
+        }
+      }
+    };
+    if (!term.prefix) {
+      collect(shard.postings[term.token] || []);
+      return docs;
+    }
+    for (let i = lowerBound(shard.tokens, term.token); i < shard.tokens.length; i++) {
+      if (!shard.tokens[i].startsWith(term.token)) {
+        break;
+      }
+      collect(shard.postings[shard.tokens[i]]);
+    }
+    return docs;
+  }
+
+  async function search(query) {
+    const index = await loadManifest();
+    const terms = parseQuery(index, query);
+    if (!terms.length) {
+      return null;
+    }
+    const loaded = await Promise.all(terms.map((term) => loadShard(index, term.token)));
+    let result = null;
+    terms.forEach((term, position) => {
+      const docs = matchTerm(loaded[position], term);
+      result = result ? new Set([...result].filter((doc) => docs.has(doc))) : docs;
+    });
+    return new Set([...result].map((doc) => index.docs[doc]));
+  }
+
+  function show(keys) {
+    let visible = 0;
+    for (const item of items) {
+      item.hidden = keys !== null && !keys.has(item.getAttribute("data-publication-key"));
+      visible += item.hidden ? 0 : 1;
+    }
+    // Hide the year headings whose list has no match left.
+    for (const list of lists) {
+      const empty = !list.querySelector("[data-publication-key]:not([hidden])");
+      list.hidden = empty;
+      if (list.previousElementSibling) {
+        list.previousElementSibling.hidden = empty;
+      }
+    }
+    status.textContent = keys === null ? "" : `${visible} of ${items.length} publications`;
+  }
+
+  input.addEventListener("focus", () => loadManifest().catch(() => {}), { once: true });
+  input.addEventListener("input", () => {
+    const current = ++generation;
+    search(input.value).then(
+      (keys) => current === generation && show(keys),
+      () => {
+        status.textContent = "Search is unavailable.";
+      }
+    );
+  });
+  form.addEventListener("submit", (event) => event.preventDefault());
+  form.hidden = false;
+})();
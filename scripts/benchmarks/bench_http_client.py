@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare per-request latency of one-shot urllib fetches with the pooled HttpClient.
+
+A local stand-in HTTP server serves a DBLP-sized BibTeX record. Each new
+connection is delayed by --handshake-ms to approximate the TCP+TLS setup cost
+paid against dblp.org, which the pooled client only pays once per connection.
+
+Usage:
+    python3 scripts/benchmarks/bench_http_client.py --requests 200 --handshake-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import site_sync as sync  # noqa: E402
+
+PAYLOAD = (
+    "@inproceedings{DBLP:conf/iclr/Example25,\n"
+    + "".join(f"  field{i:<8} = {{Some wrapped value for field {i} of the record}},\n" for i in range(40))
+    + "}\n"
+).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    bytes_sent = 0
+
+    def setup(self) -> None:
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def do_GET(self) -> None:
+        body = PAYLOAD
+        compressed = "gzip" in self.headers.get("Accept-Encoding", "")
+        if compressed:
+            body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+        type(self).bytes_sent += len(body)
+
+
+def fetch_urllib(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": "bench"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def measure(label: str, fetch, url: str, count: int) -> None:
+    StandInHandler.bytes_sent = 0
+    latencies: list[float] = []
+    for _ in range(count):
+        start = time.perf_counter()
+        body = fetch(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if body != PAYLOAD:
+            raise SystemExit(f"{label}: unexpected response body")
+    latencies.sort()
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+    print(
+        f"{label:<16} mean {statistics.fmean(latencies):7.2f} ms  "
+        f"p50 {statistics.median(latencies):7.2f} ms  p95 {p95:7.2f} ms  "
+        f"bytes/request {StandInHandler.bytes_sent / count:8.0f}"
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client (default: 200)")
+    parser.add_argument("--handshake-ms", type=float, default=20.0, help="Simulated connection setup delay (default: 20)")
+    args = parser.parse_args(argv)
+
+    StandInHandler.handshake_seconds = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rec/conf/iclr/Example25.bib"
+
+    client = sync.HttpClient()
+    try:
+        print(f"{args.requests} sequential GETs, {args.handshake_ms:g} ms simulated handshake, {len(PAYLOAD)} byte record")
+        measure("urllib (old)", fetch_urllib, url, args.requests)
+        measure("pooled client", lambda target: client.get(target, {"User-Agent": "bench"}).body, url, args.requests)
+    finally:
+        client.close()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
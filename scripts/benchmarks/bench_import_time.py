@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Import-time benchmark for the site_sync package.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime`` and
+reports how many modules were imported, their summed self time, and which of
+the network/XML stacks were loaded:
+
+  cv-only        CV sync from a local LaTeX file (--skip-publications)
+  publications   publication sync against a local stand-in DBLP server
+  eager          every site_sync submodule imported up front, which is what
+                 the single-file script used to cost on every run
+
+Usage:
+    python3 scripts/benchmarks/bench_import_time.py
+    python3 scripts/benchmarks/bench_import_time.py --repeat 10 --json imports.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+ROOT = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_sync_pipeline import FIXTURE_PID, make_fixtures, serve_fixtures  # noqa: E402
+
+HEAVY_MODULES = ("xml.etree.ElementTree", "http.client", "ssl", "urllib.request", "concurrent.futures", "gzip")
+EAGER_SNIPPET = (
+    "import importlib, pkgutil, site_sync\n"
+    "for info in pkgutil.iter_modules(site_sync.__path__):\n"
+    "    if info.name != '__main__':\n"
+    "        importlib.import_module('site_sync.' + info.name)\n"
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_scenario(command: list[str]) -> dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=str(SCRIPTS_DIR), PYTHONDONTWRITEBYTECODE="")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {completed.returncode}:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def summarise(name: str, runs: list[dict[str, int]]) -> dict[str, Any]:
+    totals = sorted(sum(modules.values()) / 1000 for modules in runs)
+    last = runs[-1]
+    return {
+        "scenario": name,
+        "modules": len(last),
+        "site_sync_modules": sum(1 for module in last if module.startswith("site_sync")),
+        "self_ms_p50": statistics.median(totals),
+        "self_ms_min": totals[0],
+        "heavy_loaded": [module for module in HEAVY_MODULES if module in last],
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Interpreter launches per scenario (default: 5)")
+    parser.add_argument("--json", type=Path, help="Also write results as JSON to this path")
+    args = parser.parse_args(argv)
+    repeat = max(args.repeat, 1)
+
+    fixtures = make_fixtures(10)
+    server = serve_fixtures(fixtures)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results: list[dict[str, Any]] = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            cv_source = workdir / "main.tex"
+            cv_source.write_text(fixtures.cv_tex, encoding="utf-8")
+            script = str(SCRIPTS_DIR / "sync_cv_and_publications.py")
+            # Every output goes to workdir, never to the site tree.
+            common = [
+                "--no-fingerprints", "--no-cache", "--state-file", str(workdir / "state.json"),
+                "--fingerprint-dir", str(workdir / "fingerprints"), "--fragments-dir", str(workdir / "fragments"),
+                "--fragment-manifest", str(workdir / "fragments.json"),
+                "--search-index-dir", str(workdir / "search"),
+            ]
+            scenarios = {
+                "cv-only": [
+                    script, "--skip-publications", "--cv-source-file", str(cv_source),
+                    "--cv-tex-dest", str(workdir / "cv.tex"), "--cv-data-dest", str(workdir / "cv.yml"), *common,
+                ],
+                "publications": [
+                    script, "--skip-cv", "--dblp-pid", FIXTURE_PID, "--dblp-base-url", base_url,
+                    "--bib-dest", str(workdir / "papers.bib"),
+                    "--publication-citations-dest", str(workdir / "citations.json"), *common,
+                ],
+                "eager": ["-c", EAGER_SNIPPET],
+            }
+            run_scenario(scenarios["eager"])  # warm-up: write bytecode caches
+            for name, command in scenarios.items():
+                results.append(summarise(name, [run_scenario(command) for _ in range(repeat)]))
+    finally:
+        server.shutdown()
+
+    print(f"{'scenario':<14} {'modules':>8} {'site_sync':>10} {'self ms p50':>12} {'self ms min':>12}  heavy modules")
+    for row in results:
+        print(
+            f"{row['scenario']:<14} {row['modules']:>8} {row['site_sync_modules']:>10} "
+            f"{row['self_ms_p50']:>12.2f} {row['self_ms_min']:>12.2f}  {', '.join(row['heavy_loaded']) or '-'}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Stage-by-stage benchmark of the site_sync package behind scripts/sync_cv_and_publications.py.
+
+Synthetic DBLP XML, BibTeX and LaTeX CV fixtures are generated
+deterministically for each requested size, and DBLP (plus the Semantic
+Scholar batch endpoint used by --enrich) is replaced by a local stand-in HTTP
+server. Every stage reports throughput (records/s), latency
+percentiles across repeats, and peak traced memory from one extra run.
+
+Usage:
+    python3 scripts/benchmarks/bench_sync_pipeline.py
+    python3 scripts/benchmarks/bench_sync_pipeline.py --sizes 10,1000 --repeat 5 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import site_sync as sync  # noqa: E402
+
+DEFAULT_SIZES = "10,1000,100000"
+FIXTURE_PID = "000/0000"
+
+WORDS = (
+    "adaptive federated decoupled optimizers local updates language models pre-training "
+    "communication efficient sparse mixture experts unlearning embeddings distributed "
+    "scalable robust private multimodal heterogeneous bandwidth momentum"
+).split()
+FIRST_NAMES = ("Alex", "Lorenzo", "Meghdad", "William F.", "Xinchi", "Nicholas D.", "Samuel", "Mher")
+LAST_NAMES = ("Iacob", "Sani", "Kurmanji", "Shen", "Qiu", "Lane", "Horv{\\'{a}}th", "Safaryan")
+CONFERENCES = ("ICLR", "NeurIPS", "ICML", "MLSys", "EuroMLSys")
+
+
+@dataclass(frozen=True)
+class Fixtures:
+    size: int
+    dblp_xml: str
+    dblp_bib: str
+    cv_tex: str
+
+
+def make_fixtures(size: int, seed: int = 0) -> Fixtures:
+    # Roughly one work in three has arXiv, workshop and conference versions so
+    # the duplicate-selection stage has real work to do.
+    rnd = random.Random(seed)
+    xml_parts = [f'<?xml version="1.0" encoding="US-ASCII"?>\n<dblpperson name="Bench" pid="{FIXTURE_PID}" n="{size}">']
+    bib_entries: list[str] = []
+    work = 0
+    versions_left = 0
+    title = ""
+    for index in range(size):
+        if versions_left == 0:
+            work += 1
+            versions_left = rnd.choice((1, 1, 3))
+            words = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 8)))
+            title = f"Work {work}: {words.title()}"
+        versions_left -= 1
+        year = 2015 + rnd.randint(0, 11)
+        kind = rnd.choice(("arxiv", "workshop", "conference"))
+        if kind == "arxiv":
+            tag, venue_tag, venue, key = "article", "journal", "CoRR", f"journals/corr/abs-{index:07d}"
+        else:
+            tag, venue_tag, key = "inproceedings", "booktitle", f"conf/bench/P{index:07d}"
+            venue = rnd.choice(CONFERENCES) + (" Workshop" if kind == "workshop" else "")
+        authors = [f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}" for _ in range(rnd.randint(2, 9))]
+        mdate = f"2025-{1 + index % 12:02d}-{1 + index % 28:02d}"
+        xml_authors = "".join(f"<author>{name.replace('{', '').replace('}', '').replace(chr(92), '')}</author>" for name in authors)
+        xml_parts.append(
+            f'<r><{tag} key="{key}" mdate="{mdate}">{xml_authors}<title>{title}.</title>'
+            f"<year>{year}</year><{venue_tag}>{venue}</{venue_tag}></{tag}></r>"
+        )
+        author_lines = " and\n                  ".join(authors)
+        bib_entries.append(
+            f"@{tag}{{DBLP:{key},\n"
+            f"  author       = {{{author_lines}}},\n"
+            f"  title        = {{{title}}},\n"
+            f"  {venue_tag:<12} = {{{venue}}},\n"
+            f"  year         = {{{year}}},\n"
+            f"  url          = {{https://example.org/{index}}},\n"
+            f"  doi          = {{10.5555/bench.{index}}}\n"
+            "}"
+        )
+    xml_parts.append("</dblpperson>")
+    return Fixtures(
+        size=size,
+        dblp_xml="\n".join(xml_parts),
+        dblp_bib="\n\n".join(bib_entries) + "\n",
+        cv_tex=make_cv_tex(size, rnd),
+    )
+
+
+def make_cv_tex(size: int, rnd: random.Random) -> str:
+    per_section = max(size // 5, 1)
+    lines = ["\\documentclass{moderncv}", "\\begin{document}", "\\section{Education}"]
+    for index in range(per_section):
+        lines.append(
+            f"\\edentry[0.5em]{{Oct {index % 30:02d}--Jul {index % 30:02d}}}{{Degree {index}}}"
+            f"{{\\textsb{{University {index}}}}}{{}}{{}}{{\\begin{{itemize}}"
+            f"\\item \\textbf{{Distinction}} in {rnd.choice(WORDS)} \\item Advisor: Dr.~{rnd.choice(LAST_NAMES)}"
+            "\\end{itemize}}"
+        )
+    lines.append("\\section{Work Experience}")
+    for index in range(per_section):
+        lines.append(
+            f"\\cventry[0.8em]{{Jan. {index % 30:02d}--Present}}{{Role {index}}}{{Org {index}}}{{City}}{{}}{{"
+            f"\\begin{{itemize}}\\item Built \\textit{{{rnd.choice(WORDS)}}} systems, 50\\% faster"
+            f"\\item \\href{{https://example.org/{index}}}{{Project {index}}}\\end{{itemize}}}}"
+        )
+    lines.append("\\section{Technical Skills}")
+    for index in range(per_section):
+        lines.append(f"\\cvitem{{Skill {index}}}{{PyTorch, \\textsb{{{rnd.choice(WORDS)}}}, {{A, B}}, Slurm}}")
+    for section in ("Selected Publications", "Extended Publications"):
+        lines.append(f"\\section{{{section}}}")
+        for index in range(per_section):
+            lines.append(
+                f"\\cvitem[0.3em]{{ICLR '{index % 30:02d}}}{{\\textsb{{Alex Iacob}}, et al. "
+                f"``{rnd.choice(WORDS).title()} {index}''. In: \\textit{{Workshop {index}}}.}}"
+            )
+    lines.append("\\end{document}")
+    return "\n".join(lines) + "\n"
+
+
+class StandInDblpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    documents: dict[str, bytes] = {}
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def do_GET(self) -> None:
+        body = self.documents.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        compressed = "gzip" in self.headers.get("Accept-Encoding", "")
+        if compressed:
+            body = gzip.compress(body, compresslevel=1)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        # Semantic Scholar-style batch lookup: one answer per requested id,
+        # null for every seventh paper to exercise the "unknown" path.
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))))
+        if not self.path.startswith("/graph/v1/paper/batch"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        answers = []
+        for lookup_id in payload["ids"]:
+            digest = hashlib.sha256(lookup_id.encode("utf-8")).digest()
+            if digest[0] % 7 == 0:
+                answers.append(None)
+                continue
+            doi = lookup_id.removeprefix("DOI:")
+            answers.append({"paperId": digest.hex()[:40], "citationCount": digest[1], "externalIds": {"DOI": doi}})
+        body = json.dumps(answers).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_fixtures(fixtures: Fixtures) -> ThreadingHTTPServer:
+    StandInDblpHandler.documents = {
+        f"/pid/{FIXTURE_PID}.xml": fixtures.dblp_xml.encode("utf-8"),
+        f"/pid/{FIXTURE_PID}.bib": fixtures.dblp_bib.encode("utf-8"),
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInDblpHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def measure(stage: str, size: int, repeat: int, run: Callable[[], Any]) -> dict[str, Any]:
+    run()  # warm-up: imports, regex compilation, connection setup
+    sync.latex_to_plain.cache_clear()
+    sync.bibtex_value_to_plain.cache_clear()
+    latencies: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+        sync.latex_to_plain.cache_clear()
+        sync.bibtex_value_to_plain.cache_clear()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    sync.latex_to_plain.cache_clear()
+    sync.bibtex_value_to_plain.cache_clear()
+
+    latencies.sort()
+    median = statistics.median(latencies)
+    return {
+        "stage": stage,
+        "records": size,
+        "repeat": repeat,
+        "records_per_second": size / median if median else float("inf"),
+        "p50_ms": median * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def bench_size(size: int, repeat: int, workdir: Path) -> list[dict[str, Any]]:
+    fixtures = make_fixtures(size)
+    server = serve_fixtures(fixtures)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    sync.configure_dblp_base_url(base_url)
+    sync.configure_http_cache(None)
+    candidates = list(sync.iter_dblp_candidates(sync.iter_text_chunks(fixtures.dblp_xml)))
+    cv_data = sync.extract_cv_data(fixtures.cv_tex)
+
+    def extract_fields() -> None:
+        for record in sync.iter_bibtex_records(fixtures.dblp_bib):
+            sync.bibtex_value_to_plain(record.field("title"))
+            sync.parse_bibtex_authors(record)
+            record.with_key("bench-key").render()
+
+    def end_to_end() -> None:
+        sync.sync_publications(
+            dblp_pid=FIXTURE_PID,
+            bib_dest=workdir / f"papers-{size}.bib",
+            citation_data_dest=workdir / f"citations-{size}.json",
+        )
+
+    def enrich() -> None:
+        # Cold cache: every paper is looked up, batch_size ids per request.
+        graph = sync.TaskGraph()
+        sync.add_enrichment_tasks(
+            graph,
+            bib_path=workdir / f"papers-{size}.bib",
+            dest=workdir / f"enrichment-{size}.json",
+            provider=sync.SemanticScholarProvider(base_url),
+            cache_path=None,
+        )
+        graph.run()
+
+    stages: list[tuple[str, Callable[[], Any]]] = [
+        ("fetch_dblp_candidates", lambda: list(sync.fetch_dblp_candidates(FIXTURE_PID))),
+        ("select_highest_level", lambda: sync.select_highest_level_publications(candidates)),
+        ("bibtex_fields", extract_fields),
+        ("extract_cv_data", lambda: sync.extract_cv_data(fixtures.cv_tex)),
+        ("dump_yaml", lambda: sync.dump_yaml(cv_data)),
+        ("sync_publications", end_to_end),
+        ("enrich_publications", enrich),
+    ]
+    try:
+        return [measure(stage, size, repeat, run) for stage, run in stages]
+    finally:
+        server.shutdown()
+        sync.configure_dblp_base_url(sync.DEFAULT_DBLP_BASE_URL)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated record counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (default: 3)")
+    parser.add_argument("--json", type=Path, help="Also write results as JSON to this path")
+    args = parser.parse_args(argv)
+    sizes = [int(part) for part in args.sizes.split(",") if part.strip()]
+
+    results: list[dict[str, Any]] = []
+    print(f"{'stage':<22} {'records':>8} {'records/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for row in bench_size(size, max(args.repeat, 1), Path(tmp)):
+                results.append(row)
+                print(
+                    f"{row['stage']:<22} {row['records']:>8} {row['records_per_second']:>12,.0f} "
+                    f"{row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} {row['max_ms']:>10.2f} {row['peak_mib']:>9.2f}"
+                )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,61 @@
+"""Sync website CV/publications content from canonical LaTeX and DBLP sources.
+
+The package is split by layer (cv, tex/latex, dblp, bibtex, publications,
+fragments, searchindex, enrichment, images, net, batch) and submodules are
+imported on first attribute access, so ``import site_sync`` itself loads
+nothing beyond this file. The command-line entry point is ``site_sync.cli.main``
+(``scripts/sync_cv_and_publications.py``).
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS: dict[str, str] = {
+    "main": "cli",
+    "DEFAULT_DBLP_BASE_URL": "config",
+    "reset_metrics": "metrics",
+    "configure_fingerprints": "fingerprints",
+    "HttpClient": "net",
+    "configure_dblp_base_url": "net",
+    "configure_http_cache": "net",
+    "configure_http_fixtures": "net",
+    "latex_to_plain": "latex",
+    "IncrementalCvExtractor": "cv",
+    "dump_yaml": "cv",
+    "extract_cv_data": "cv",
+    "sync_cv": "cv",
+    "watch_cv": "cv",
+    "DblpCandidate": "dblp",
+    "fetch_dblp_candidates": "dblp",
+    "iter_dblp_candidates": "dblp",
+    "iter_text_chunks": "dblp",
+    "select_highest_level_publications": "dblp",
+    "BibtexRecord": "bibtex",
+    "bibtex_field_changes": "bibtex",
+    "bibtex_value_to_plain": "bibtex",
+    "iter_bibtex_records": "bibtex",
+    "parse_bibtex_authors": "bibtex",
+    "parse_bibtex_entry": "bibtex",
+    "sync_publications": "publications",
+    "add_fragment_tasks": "fragments",
+    "add_search_index_tasks": "searchindex",
+    "ImageEncoder": "images",
+    "add_image_tasks": "images",
+    "load_yaml": "yamldata",
+    "MetadataProvider": "enrichment",
+    "SemanticScholarProvider": "enrichment",
+    "add_enrichment_tasks": "enrichment",
+    "TaskGraph": "orchestrator",
+    "sync_batch": "batch",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
@@ -0,0 +1,251 @@
+"""Multi-author sync from a JSON manifest over a process pool."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import urllib.error
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .bibtex import BibtexRecord, fetch_bibtex_index, fetch_bibtex_records
+from .config import DEFAULT_CV_BRANCH, DEFAULT_CV_REPO
+from .cv import add_cv_tasks
+from .dblp import (
+    DblpCandidate,
+    fetch_dblp_profile,
+    iter_dblp_candidates,
+    iter_text_chunks,
+    select_highest_level_publications,
+    slugify,
+)
+from .fingerprints import configure_fingerprints
+from .metrics import _metrics, reset_metrics
+from .net import configure_dblp_base_url, configure_http_cache, configure_http_fixtures
+from .orchestrator import TaskGraph
+from .publications import add_publication_tasks, load_sync_state, plan_publication_records
+
+
+@dataclass(frozen=True)
+class BatchMember:
+    name: str
+    dblp_pid: str | None
+    cv_source_file: Path | None
+    cv_tex_dest: Path | None
+    cv_data_dest: Path | None
+    bib_dest: Path | None
+    citation_data_dest: Path | None
+    state_file: Path | None
+
+
+def load_batch_manifest(path: Path, state_dir: Path | None) -> list[BatchMember]:
+    # Manifest format (relative paths resolve against the manifest directory):
+    # {"members": [{"name": "...", "dblp_pid": "...", "cv_source_file": "...",
+    #   "cv_tex_dest": "...", "cv_data_dest": "...", "bib_dest": "...",
+    #   "publication_citations_dest": "...", "state_file": "..."}]}
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    base = path.resolve().parent
+    raw_members = manifest.get("members") if isinstance(manifest, dict) else None
+    if not isinstance(raw_members, list) or not raw_members:
+        raise ValueError(f"Batch manifest {path} must contain a non-empty 'members' list")
+
+    def optional_path(raw: dict[str, Any], field: str) -> Path | None:
+        value = raw.get(field)
+        return base / str(value) if value else None
+
+    members: list[BatchMember] = []
+    names: set[str] = set()
+    for raw in raw_members:
+        name = str(raw.get("name", "")).strip() if isinstance(raw, dict) else ""
+        if not name or name in names:
+            raise ValueError(f"Batch manifest {path}: every member needs a unique 'name'")
+        names.add(name)
+        member = BatchMember(
+            name=name,
+            dblp_pid=str(raw["dblp_pid"]) if raw.get("dblp_pid") else None,
+            cv_source_file=optional_path(raw, "cv_source_file"),
+            cv_tex_dest=optional_path(raw, "cv_tex_dest"),
+            cv_data_dest=optional_path(raw, "cv_data_dest"),
+            bib_dest=optional_path(raw, "bib_dest"),
+            citation_data_dest=optional_path(raw, "publication_citations_dest"),
+            state_file=optional_path(raw, "state_file")
+            or (state_dir / f"publication-sync-state-{slugify(name)}.json" if state_dir else None),
+        )
+        if member.dblp_pid and not (member.bib_dest and member.citation_data_dest):
+            raise ValueError(f"Batch member {name}: dblp_pid requires bib_dest and publication_citations_dest")
+        if member.cv_source_file and not (member.cv_tex_dest and member.cv_data_dest):
+            raise ValueError(f"Batch member {name}: cv_source_file requires cv_tex_dest and cv_data_dest")
+        members.append(member)
+    return members
+
+
+def init_batch_worker(
+    cache_dir: Path | None,
+    fingerprint_dir: Path | None,
+    dblp_base_url: str,
+    record_dir: Path | None,
+    replay_dir: Path | None,
+) -> None:
+    configure_http_fixtures(record_dir, replay_dir, clear=False)
+    configure_http_cache(cache_dir)
+    configure_fingerprints(fingerprint_dir)
+    configure_dblp_base_url(dblp_base_url)
+    reset_metrics()
+
+
+def fetch_member_selection(dblp_pid: str) -> tuple[list[DblpCandidate], str, dict[str, float]]:
+    metrics = reset_metrics()
+    profile_xml = fetch_dblp_profile(dblp_pid)
+    selected = select_highest_level_publications(iter_dblp_candidates(iter_text_chunks(profile_xml)))
+    profile_digest = hashlib.sha256(profile_xml.encode("utf-8")).hexdigest()
+    return selected, profile_digest, metrics.report()["counters"]
+
+
+def resolve_shared_bibtex(
+    keys_by_pid: dict[str, list[str]],
+    max_concurrency: int,
+    bulk_bibtex: bool,
+) -> dict[str, BibtexRecord]:
+    # Co-authored records appear in several members' profiles; each distinct
+    # DBLP key is resolved once. Bulk files are tried largest-need first and
+    # skipped once every key they could provide is already resolved.
+    needed = {key for keys in keys_by_pid.values() for key in keys}
+    fetched: dict[str, BibtexRecord] = {}
+    if bulk_bibtex:
+        for pid, keys in sorted(keys_by_pid.items(), key=lambda item: -len(item[1])):
+            if all(key in fetched for key in keys):
+                continue
+            try:
+                index = fetch_bibtex_index(pid)
+            except (urllib.error.URLError, ValueError) as error:
+                print(f"[batch] bulk BibTeX file unusable for {pid}: {error}", file=sys.stderr)
+                continue
+            fetched.update((key, index[key]) for key in needed if key in index and key not in fetched)
+    missing_keys = sorted(needed - fetched.keys())
+    fetched.update(zip(missing_keys, fetch_bibtex_records(missing_keys, max_concurrency)))
+    return fetched
+
+
+def run_batch_member(
+    member: BatchMember,
+    selected: list[DblpCandidate] | None,
+    profile_digest: str | None,
+    prefetched_bibtex: dict[str, BibtexRecord],
+    max_concurrency: int,
+    bulk_bibtex: bool,
+    full_sync: bool,
+) -> dict[str, Any]:
+    metrics = reset_metrics()
+    summary: dict[str, Any] = {"name": member.name}
+    graph = TaskGraph()
+    cv_run = None
+    pub_run = None
+    if member.cv_source_file and member.cv_tex_dest and member.cv_data_dest:
+        cv_run = add_cv_tasks(
+            graph,
+            cv_source_file=member.cv_source_file,
+            cv_repo=DEFAULT_CV_REPO,
+            cv_branch=DEFAULT_CV_BRANCH,
+            cv_tex_dest=member.cv_tex_dest,
+            cv_data_dest=member.cv_data_dest,
+        )
+    if member.dblp_pid and member.bib_dest and member.citation_data_dest:
+        pub_run = add_publication_tasks(
+            graph,
+            dblp_pid=member.dblp_pid,
+            bib_dest=member.bib_dest,
+            citation_data_dest=member.citation_data_dest,
+            max_concurrency=max_concurrency,
+            bulk_bibtex=bulk_bibtex,
+            state_path=member.state_file,
+            full_sync=full_sync,
+            selected=selected,
+            prefetched_bibtex=prefetched_bibtex,
+            profile_digest=profile_digest,
+        )
+    with metrics.phase("stages"):
+        graph.run()
+    if cv_run is not None:
+        summary["cv_tex_changed"], summary["cv_data_changed"] = cv_run.tex_changed, cv_run.data_changed
+    if pub_run is not None:
+        summary.update(
+            {
+                "publications": pub_run.total,
+                "bib_changed": pub_run.bib_changed,
+                "citations_changed": pub_run.citation_changed,
+                "changeset": pub_run.changeset.to_dict(),
+            }
+        )
+    summary["metrics"] = metrics.report()
+    return summary
+
+
+def sync_batch(
+    members: list[BatchMember],
+    workers: int,
+    max_concurrency: int,
+    bulk_bibtex: bool,
+    full_sync: bool,
+    cache_dir: Path | None,
+    fingerprint_dir: Path | None,
+    dblp_base_url: str,
+    record_dir: Path | None = None,
+    replay_dir: Path | None = None,
+) -> list[dict[str, Any]]:
+    # Stage 1 fetches and parses every distinct profile in the process pool.
+    # Stage 2 resolves the union of needed BibTeX records once, here. Stage 3
+    # fans members out again with their share of the shared records.
+    pids = sorted({member.dblp_pid for member in members if member.dblp_pid})
+    with ProcessPoolExecutor(
+        max_workers=max(min(workers, len(members)), 1),
+        initializer=init_batch_worker,
+        initargs=(cache_dir, fingerprint_dir, dblp_base_url, record_dir, replay_dir),
+    ) as pool:
+        with _metrics.phase("batch.fetch_profiles"):
+            selections: dict[str, list[DblpCandidate]] = {}
+            digests: dict[str, str] = {}
+            for pid, (selected, digest, counters) in zip(pids, pool.map(fetch_member_selection, pids)):
+                selections[pid] = selected
+                digests[pid] = digest
+                for name, value in counters.items():
+                    _metrics.add(name, value)
+
+        keys_by_pid: dict[str, list[str]] = {pid: [] for pid in pids}
+        member_keys: dict[str, list[str]] = {}
+        for member in members:
+            if not member.dblp_pid:
+                continue
+            state = load_sync_state(member.state_file)
+            if full_sync:
+                state["records"] = {}
+            _, _, fetch_keys = plan_publication_records(selections[member.dblp_pid], state)
+            member_keys[member.name] = fetch_keys
+            keys_by_pid[member.dblp_pid].extend(fetch_keys)
+        _metrics.add("batch.bibtex_requested", sum(len(keys) for keys in member_keys.values()))
+        with _metrics.phase("batch.fetch_bibtex"):
+            shared = resolve_shared_bibtex(keys_by_pid, max_concurrency, bulk_bibtex)
+        _metrics.add("batch.bibtex_unique", len(shared))
+
+        with _metrics.phase("batch.members"):
+            futures = [
+                pool.submit(
+                    run_batch_member,
+                    member,
+                    selections.get(member.dblp_pid) if member.dblp_pid else None,
+                    digests.get(member.dblp_pid) if member.dblp_pid else None,
+                    {key: shared[key] for key in member_keys.get(member.name, []) if key in shared},
+                    max_concurrency,
+                    bulk_bibtex,
+                    full_sync,
+                )
+                for member in members
+            ]
+            summaries = [future.result() for future in futures]
+
+    for summary in summaries:
+        for name, value in summary["metrics"]["counters"].items():
+            _metrics.add(name, value)
+    return summaries
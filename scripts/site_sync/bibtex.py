@@ -0,0 +1,319 @@
+"""DBLP BibTeX parsing, retrieval and field extraction."""
+
+from __future__ import annotations
+
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator
+
+from .latex import BIBTEX_COMMAND_RE, PLAIN_TEXT_CACHE_SIZE, decode_latex_accents
+from .net import dblp_url, fetch_text
+
+BIBTEX_FIELD_WIDTH = 12
+BIBTEX_SKIPPED_TYPES = frozenset({"comment", "preamble", "string"})
+BIBTEX_ENTRY_START_RE = re.compile(r"@\s*([A-Za-z]+)\s*([{(])\s*")
+BIBTEX_KEY_RE = re.compile(r"([^,\s{}()]*)\s*,?\s*")
+BIBTEX_FIELD_NAME_RE = re.compile(r"([A-Za-z][\w:.+-]*)\s*=\s*")
+BIBTEX_BARE_VALUE_RE = re.compile(r"[^\s,#{}()\"]+")
+BIBTEX_BRACE_RE = re.compile(r"[{}]")
+BIBTEX_QUOTE_TOKEN_RE = re.compile(r'[{}"]')
+BIBTEX_SEPARATOR_RE = re.compile(r"\s*(?:#\s*)?")
+BIBTEX_FIELD_END_RE = re.compile(r"\s*,?\s*")
+# Fast path for the common case (a braced value nested at most three deep,
+# as DBLP writes them); anything else falls back to the token scanner.
+BIBTEX_SIMPLE_FIELD_RE = re.compile(
+    r"([A-Za-z][\w:.+-]*)\s*=\s*(\{(?:[^{}]++|\{(?:[^{}]++|\{[^{}]*+\})*+\})*+\})(?!\s*#)\s*,?\s*"
+)
+# Field order of canonical records (DBLP's own order); other fields follow
+# alphabetically.
+BIBTEX_FIELD_ORDER = (
+    "author",
+    "editor",
+    "title",
+    "booktitle",
+    "journal",
+    "series",
+    "volume",
+    "number",
+    "pages",
+    "publisher",
+    "address",
+    "year",
+    "month",
+    "url",
+    "doi",
+    "eprinttype",
+    "eprint",
+    "archiveprefix",
+    "timestamp",
+    "biburl",
+    "bibsource",
+)
+BIBTEX_FIELD_RANK = {name: rank for rank, name in enumerate(BIBTEX_FIELD_ORDER)}
+# Name lists are written one name per line, aligned like DBLP's records.
+BIBTEX_NAME_LIST_FIELDS = frozenset({"author", "editor"})
+# DBLP bookkeeping that changes without the publication changing.
+BIBTEX_VOLATILE_FIELDS = frozenset({"timestamp", "biburl", "bibsource"})
+BIBTEX_NAME_SEPARATOR_RE = re.compile(r"[{}]| and ")
+
+
+# One parsed BibTeX entry. Field names and the entry type are lower-cased;
+# values keep their source text (delimiters, nested braces and DBLP's line
+# continuations) so that render() reproduces DBLP records byte for byte.
+# canonical() gives the layout-independent form written to papers.bib.
+@dataclass(frozen=True)
+class BibtexRecord:
+    entry_type: str
+    key: str
+    fields: tuple[tuple[str, str], ...]
+
+    def raw(self, name: str) -> str:
+        for field_name, value in self.fields:
+            if field_name == name:
+                return value
+        return ""
+
+    def field(self, name: str) -> str:
+        value = self.raw(name)
+        if len(value) >= 2 and (value[0], value[-1]) in (("{", "}"), ('"', '"')):
+            value = value[1:-1]
+        return " ".join(value.split())
+
+    def with_key(self, key: str) -> BibtexRecord:
+        return BibtexRecord(self.entry_type, key, self.fields)
+
+    def canonical(self) -> BibtexRecord:
+        # Fixed field order, the first of duplicated fields, normalized values
+        # and one name per line in name lists: records that differ only in
+        # layout render identically.
+        fields: dict[str, str] = {}
+        for name, value in self.fields:
+            fields.setdefault(name, value)
+        ordered = sorted(fields.items(), key=lambda item: bibtex_field_rank(item[0]))
+        return BibtexRecord(
+            self.entry_type.lower(),
+            self.key,
+            tuple((name, canonical_bibtex_value(name, value)) for name, value in ordered),
+        )
+
+    def render(self) -> str:
+        lines = [f"  {name:<{BIBTEX_FIELD_WIDTH}} = {value}" for name, value in self.fields]
+        return f"@{self.entry_type}{{{self.key},\n" + ",\n".join(lines) + "\n}"
+
+
+def skip_braced(text: str, start: int) -> int:
+    # BibTeX counts every brace, escaped or not, so no TeX escape handling here.
+    depth = 0
+    for match in BIBTEX_BRACE_RE.finditer(text, start):
+        if match.group() == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError(f"Unclosed BibTeX brace starting at {start}")
+
+
+def skip_quoted(text: str, start: int) -> int:
+    depth = 0
+    for match in BIBTEX_QUOTE_TOKEN_RE.finditer(text, start + 1):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif depth == 0:
+            return match.end()
+    raise ValueError(f"Unclosed BibTeX string starting at {start}")
+
+
+def scan_bibtex_value(text: str, start: int) -> int:
+    # A value is one or more braced, quoted or bare tokens joined by '#'.
+    idx = start
+    while True:
+        char = text[idx : idx + 1]
+        if char == "{":
+            idx = skip_braced(text, idx)
+        elif char == '"':
+            idx = skip_quoted(text, idx)
+        else:
+            match = BIBTEX_BARE_VALUE_RE.match(text, idx)
+            if not match:
+                raise ValueError(f"Expected a BibTeX value at index {idx}")
+            idx = match.end()
+        separator = BIBTEX_SEPARATOR_RE.match(text, idx)
+        if "#" not in separator.group():
+            return idx
+        idx = separator.end()
+
+
+def bibtex_field_rank(name: str) -> tuple[int, str]:
+    return BIBTEX_FIELD_RANK.get(name, len(BIBTEX_FIELD_RANK)), name
+
+
+def normalize_bibtex_value(value: str) -> str:
+    # BibTeX treats any run of whitespace as one space, and a quoted or bare
+    # numeric value like its braced form, so both are rewritten to DBLP's
+    # {...} style. Concatenations and macros (month = jan) are left alone.
+    value = " ".join(value.split())
+    if value.isdigit():
+        return f"{{{value}}}"
+    if value.startswith('"') and skip_quoted(value, 0) == len(value):
+        value = f"{{{value[1:-1]}}}"
+    if value.startswith("{") and skip_braced(value, 0) == len(value):
+        return f"{{{value[1:-1].strip()}}}"
+    return value
+
+
+def split_bibtex_names(value: str) -> list[str]:
+    # Splits a braced name list on the " and " separators outside nested
+    # braces, so "{Smith and Sons}" stays one name.
+    names: list[str] = []
+    depth = 0
+    start = 1
+    for match in BIBTEX_NAME_SEPARATOR_RE.finditer(value, 1, len(value) - 1):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif depth == 0:
+            names.append(value[start : match.start()])
+            start = match.end()
+    names.append(value[start : len(value) - 1])
+    return names
+
+
+def canonical_bibtex_value(name: str, value: str) -> str:
+    value = normalize_bibtex_value(value)
+    if name not in BIBTEX_NAME_LIST_FIELDS or not value.startswith("{"):
+        return value
+    # Continuation lines line up with the first name, as in DBLP's records.
+    indent = " " * (BIBTEX_FIELD_WIDTH + 6)
+    return "{" + f" and\n{indent}".join(split_bibtex_names(value)) + "}"
+
+
+def bibtex_field_changes(old: BibtexRecord, new: BibtexRecord) -> list[str]:
+    # Fields whose normalized values differ (in canonical order; "type" for
+    # the entry type), ignoring BIBTEX_VOLATILE_FIELDS and the entry key.
+    # An empty list means the records describe the same publication.
+    changes = ["type"] if old.entry_type.lower() != new.entry_type.lower() else []
+    old_fields = {name: normalize_bibtex_value(value) for name, value in reversed(old.fields)}
+    new_fields = {name: normalize_bibtex_value(value) for name, value in reversed(new.fields)}
+    names = sorted((set(old_fields) | set(new_fields)) - BIBTEX_VOLATILE_FIELDS, key=bibtex_field_rank)
+    changes.extend(name for name in names if old_fields.get(name) != new_fields.get(name))
+    return changes
+
+
+def parse_bibtex_record(text: str, start: int, entry_type: str) -> tuple[BibtexRecord, int]:
+    # `start` points just past the opening delimiter of the entry body.
+    key_match = BIBTEX_KEY_RE.match(text, start)
+    idx = key_match.end()
+    fields: list[tuple[str, str]] = []
+    while idx < len(text) and text[idx] not in "})":
+        simple = BIBTEX_SIMPLE_FIELD_RE.match(text, idx)
+        if simple:
+            fields.append((simple.group(1).lower(), simple.group(2)))
+            idx = simple.end()
+            continue
+        name_match = BIBTEX_FIELD_NAME_RE.match(text, idx)
+        if not name_match:
+            raise ValueError(f"Expected a BibTeX field name at index {idx}")
+        value_end = scan_bibtex_value(text, name_match.end())
+        fields.append((name_match.group(1).lower(), text[name_match.end() : value_end]))
+        idx = BIBTEX_FIELD_END_RE.match(text, value_end).end()
+    if idx >= len(text):
+        raise ValueError(f"Unterminated BibTeX entry starting at {start}")
+    return BibtexRecord(entry_type, key_match.group(1), tuple(fields)), idx + 1
+
+
+def iter_bibtex_records(text: str) -> Iterator[BibtexRecord]:
+    # Single left-to-right pass: text between entries is ignored, as in BibTeX,
+    # and @comment/@preamble/@string blocks are skipped whole.
+    idx = 0
+    while True:
+        idx = text.find("@", idx)
+        if idx == -1:
+            return
+        match = BIBTEX_ENTRY_START_RE.match(text, idx)
+        if not match:
+            idx += 1
+            continue
+        entry_type = match.group(1).lower()
+        if entry_type in BIBTEX_SKIPPED_TYPES:
+            idx = skip_braced(text, match.start(2)) if match.group(2) == "{" else text.find(")", match.end()) + 1
+            if idx == 0:
+                return
+            continue
+        record, idx = parse_bibtex_record(text, match.end(), entry_type)
+        yield record
+
+
+def parse_bibtex_entry(text: str) -> BibtexRecord:
+    for record in iter_bibtex_records(text):
+        return record
+    raise ValueError("No BibTeX entry found")
+
+
+def fetch_bibtex_record(dblp_key: str) -> BibtexRecord:
+    return parse_bibtex_entry(fetch_text(dblp_url(f"rec/{dblp_key}.bib")))
+
+
+def fetch_bibtex_index(pid: str) -> dict[str, BibtexRecord]:
+    # DBLP serves every record of a person in one document; records are keyed
+    # as "DBLP:<dblp_key>", matching the per-record endpoint.
+    text = fetch_text(dblp_url(f"pid/{pid}.bib"))
+    return {
+        record.key[len("DBLP:") :]: record
+        for record in iter_bibtex_records(text)
+        if record.key.startswith("DBLP:")
+    }
+
+
+def fetch_bibtex_records(dblp_keys: list[str], max_concurrency: int) -> list[BibtexRecord]:
+    # Results are returned in input order so generated outputs do not depend on
+    # which request finishes first.
+    if max_concurrency <= 1 or len(dblp_keys) <= 1:
+        return [fetch_bibtex_record(key) for key in dblp_keys]
+    workers = min(max_concurrency, len(dblp_keys))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch_bibtex_record, dblp_keys))
+
+
+@functools.lru_cache(maxsize=PLAIN_TEXT_CACHE_SIZE)
+def bibtex_value_to_plain(value: str) -> str:
+    text = value.replace("{-}", "-")
+    text = decode_latex_accents(text)
+    text = text.replace("{", "").replace("}", "")
+    text = text.replace("~", " ")
+    text = BIBTEX_COMMAND_RE.sub("", text)
+    text = text.replace("``", '"').replace("''", '"')
+    text = " ".join(text.split())
+    return text.strip()
+
+
+def parse_bibtex_authors(record: BibtexRecord) -> list[str]:
+    raw = record.field("author")
+    if not raw:
+        return []
+    parts = [part.strip() for part in raw.split(" and ") if part.strip()]
+    return [bibtex_value_to_plain(part) for part in parts]
+
+
+def build_citation(authors: list[str], venue: str, year: int) -> str:
+    if authors:
+        author_text = ", ".join(authors)
+    else:
+        author_text = ""
+    venue_text = venue.strip()
+
+    fragments = []
+    if author_text:
+        fragments.append(f"{author_text}.")
+    if venue_text:
+        fragments.append(f"{venue_text} {year}.")
+    else:
+        fragments.append(f"{year}.")
+    return " ".join(fragments)
@@ -0,0 +1,539 @@
+"""Sync website CV/publications content from canonical LaTeX and DBLP sources.
+
+This script keeps the website aligned with:
+- CV source repo: Iacob-Alexandru-Andrei/Standard_CV_2023
+- DBLP author profile: https://dblp.org/pid/346/2270
+
+Outputs:
+- assets/cv/main.tex
+- _data/cv.yml
+- _bibliography/papers.bib
+- _data/publication_citations.json
+- _data/publication_fragments.json and _includes/publications/ (HTML fragments)
+- assets/json/publication-search/ (client-side search index)
+- _data/publication_enrichment.json (with --enrich)
+- _data/responsive_images.json and assets/img/responsive/ (with --images)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .config import (
+    DEFAULT_BATCH_WORKERS,
+    DEFAULT_BIB_DEST,
+    DEFAULT_CV_BRANCH,
+    DEFAULT_CV_DATA_DEST,
+    DEFAULT_CV_REPO,
+    DEFAULT_CV_TEX_DEST,
+    DEFAULT_DBLP_BASE_URL,
+    DEFAULT_DBLP_PID,
+    DEFAULT_ENRICHMENT_CACHE_PATH,
+    DEFAULT_ENRICHMENT_PROVIDER,
+    DEFAULT_ENRICHMENT_TTL_HOURS,
+    DEFAULT_FINGERPRINT_DIR,
+    DEFAULT_FRAGMENT_MANIFEST,
+    DEFAULT_FRAGMENTS_DIR,
+    DEFAULT_HTTP_CACHE_DIR,
+    DEFAULT_IMAGE_MANIFEST,
+    DEFAULT_IMAGE_OUTPUT_DIR,
+    DEFAULT_IMAGE_SOURCE_DIR,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PUBLICATION_CITATIONS_DEST,
+    DEFAULT_PUBLICATION_ENRICHMENT_DEST,
+    DEFAULT_PUBLICATION_META,
+    DEFAULT_SEARCH_INDEX_DIR,
+    DEFAULT_SYNC_STATE_PATH,
+    DEFAULT_TASK_WORKERS,
+    HTTP_CACHE_MAX_AGE_SECONDS,
+    HTTP_CACHE_MAX_BYTES,
+    IMAGE_FORMATS,
+    IMAGE_QUALITY,
+    IMAGE_WIDTHS,
+    ROOT,
+)
+from .fingerprints import configure_fingerprints
+from .metrics import SyncMetrics, reset_metrics
+from .orchestrator import TaskGraph, TaskGraphReport
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skip-cv", action="store_true", help="Skip CV tex/data sync")
+    parser.add_argument("--skip-publications", action="store_true", help="Skip DBLP publication sync")
+    parser.add_argument("--cv-source-file", type=Path, help="Use local CV tex file instead of GitHub source")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate CV outputs whenever --cv-source-file changes",
+    )
+    parser.add_argument("--cv-repo", default=DEFAULT_CV_REPO, help=f"GitHub repo owner/name (default: {DEFAULT_CV_REPO})")
+    parser.add_argument("--cv-branch", default=DEFAULT_CV_BRANCH, help=f"GitHub branch/tag (default: {DEFAULT_CV_BRANCH})")
+    parser.add_argument("--dblp-pid", default=DEFAULT_DBLP_PID, help=f"DBLP author PID (default: {DEFAULT_DBLP_PID})")
+    parser.add_argument(
+        "--dblp-base-url",
+        default=DEFAULT_DBLP_BASE_URL,
+        help=f"DBLP mirror or stand-in server (default: {DEFAULT_DBLP_BASE_URL})",
+    )
+    parser.add_argument("--cv-tex-dest", type=Path, default=DEFAULT_CV_TEX_DEST, help="Destination for synced CV TeX")
+    parser.add_argument("--cv-data-dest", type=Path, default=DEFAULT_CV_DATA_DEST, help="Destination for generated CV data YAML")
+    parser.add_argument("--bib-dest", type=Path, default=DEFAULT_BIB_DEST, help="Destination for generated papers.bib")
+    parser.add_argument(
+        "--publication-citations-dest",
+        type=Path,
+        default=DEFAULT_PUBLICATION_CITATIONS_DEST,
+        help="Destination for generated publication citations JSON",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Maximum parallel DBLP BibTeX fetches (default: {DEFAULT_MAX_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--no-bulk-bibtex",
+        action="store_true",
+        help="Fetch each DBLP BibTeX record separately instead of the author's bulk BibTeX file",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=DEFAULT_SYNC_STATE_PATH,
+        help="Per-record sync state used to skip unchanged DBLP records",
+    )
+    parser.add_argument(
+        "--fragments-dir",
+        type=Path,
+        help="Directory for pre-rendered publication HTML fragments (default: _includes/publications/, or next to "
+        "a redirected --publication-citations-dest)",
+    )
+    parser.add_argument(
+        "--fragment-manifest",
+        type=Path,
+        help="Data file listing the publication fragments in bibliography order (default: "
+        "_data/publication_fragments.json, or next to a redirected --publication-citations-dest)",
+    )
+    parser.add_argument(
+        "--publication-meta",
+        type=Path,
+        default=DEFAULT_PUBLICATION_META,
+        help="Hand-written card metadata merged into the fragments",
+    )
+    parser.add_argument("--no-fragments", action="store_true", help="Do not render publication HTML fragments")
+    parser.add_argument(
+        "--fragments-only",
+        action="store_true",
+        help="Only re-render publication HTML fragments from the existing bibliography and card metadata (offline)",
+    )
+    parser.add_argument(
+        "--search-index-dir",
+        type=Path,
+        help="Directory for the sharded publication search index (default: assets/json/publication-search/, or "
+        "next to a redirected --publication-citations-dest)",
+    )
+    parser.add_argument("--no-search-index", action="store_true", help="Do not build the publication search index")
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Add citation counts and arXiv/OpenReview IDs from a metadata service (batched, TTL-cached)",
+    )
+    parser.add_argument(
+        "--enrichment-dest",
+        type=Path,
+        default=DEFAULT_PUBLICATION_ENRICHMENT_DEST,
+        help="Destination for generated publication enrichment JSON",
+    )
+    parser.add_argument(
+        "--enrichment-provider",
+        default=DEFAULT_ENRICHMENT_PROVIDER,
+        help=f"Metadata service for --enrich (default: {DEFAULT_ENRICHMENT_PROVIDER})",
+    )
+    parser.add_argument("--enrichment-base-url", help="Mirror or stand-in server for the metadata service")
+    parser.add_argument(
+        "--enrichment-cache",
+        type=Path,
+        default=DEFAULT_ENRICHMENT_CACHE_PATH,
+        help="Cache of metadata service answers",
+    )
+    parser.add_argument(
+        "--enrichment-ttl-hours",
+        type=float,
+        default=DEFAULT_ENRICHMENT_TTL_HOURS,
+        help=f"Refresh cached metadata older than this (default: {DEFAULT_ENRICHMENT_TTL_HOURS})",
+    )
+    parser.add_argument(
+        "--images",
+        action="store_true",
+        help="Generate resized, re-encoded variants of the site images for srcset (needs ImageMagick)",
+    )
+    parser.add_argument(
+        "--image-dir",
+        type=Path,
+        default=DEFAULT_IMAGE_SOURCE_DIR,
+        help="Directory scanned for JPEG/PNG source images",
+    )
+    parser.add_argument(
+        "--site-root",
+        type=Path,
+        default=ROOT,
+        help="Site directory the image URLs in the manifest are relative to",
+    )
+    parser.add_argument(
+        "--image-output-dir",
+        type=Path,
+        default=DEFAULT_IMAGE_OUTPUT_DIR,
+        help="Directory for the generated image variants",
+    )
+    parser.add_argument(
+        "--image-manifest",
+        type=Path,
+        default=DEFAULT_IMAGE_MANIFEST,
+        help="Data file mapping each source image to its srcset variants",
+    )
+    parser.add_argument(
+        "--image-widths",
+        default=",".join(map(str, IMAGE_WIDTHS)),
+        help=f"Comma-separated variant widths in pixels (default: {','.join(map(str, IMAGE_WIDTHS))})",
+    )
+    parser.add_argument(
+        "--image-formats",
+        default=",".join(IMAGE_FORMATS),
+        help=f"Comma-separated formats offered ahead of the original format (default: {','.join(IMAGE_FORMATS)})",
+    )
+    parser.add_argument("--full-sync", action="store_true", help="Ignore the sync state and reprocess every record")
+    parser.add_argument("--changeset", type=Path, help="Write added/updated/removed keys and changed fields as JSON")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_HTTP_CACHE_DIR,
+        help="Directory for the conditional-request HTTP cache",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the on-disk HTTP cache")
+    parser.add_argument(
+        "--fingerprint-dir",
+        type=Path,
+        default=DEFAULT_FINGERPRINT_DIR,
+        help="Directory for stage input fingerprints used to skip unchanged stages",
+    )
+    parser.add_argument("--no-fingerprints", action="store_true", help="Always run every stage")
+    parser.add_argument("--batch", type=Path, help="Sync every member listed in this JSON manifest")
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help=f"Worker processes for --batch (default: {DEFAULT_BATCH_WORKERS})",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Record every HTTP exchange into DIR for later --replay (implies --no-cache)",
+    )
+    fixtures.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Serve HTTP requests from a --record archive in DIR without touching the network",
+    )
+    parser.add_argument("--metrics", type=Path, help="Write per-phase timings and HTTP counters as JSON")
+    parser.add_argument("--profile", type=Path, help="Write cProfile stats for the whole run (view with pstats)")
+    args = parser.parse_args(argv)
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    if args.batch_workers < 1:
+        parser.error("--batch-workers must be at least 1")
+    if args.watch and not args.cv_source_file:
+        parser.error("--watch requires --cv-source-file")
+    if args.enrich and args.batch:
+        parser.error("--enrich is not supported with --batch")
+    if args.fragments_only and (args.batch or args.no_fragments):
+        parser.error("--fragments-only cannot be combined with --batch or --no-fragments")
+    if args.images and args.batch:
+        parser.error("--images is not supported with --batch")
+    try:
+        args.image_widths = tuple(int(width) for width in args.image_widths.split(",") if width.strip())
+    except ValueError:
+        parser.error("--image-widths must be comma-separated integers")
+    if not args.image_widths or min(args.image_widths) < 1:
+        parser.error("--image-widths must list at least one positive width")
+    args.image_formats = tuple(name.strip().lower() for name in args.image_formats.split(",") if name.strip())
+    unknown = sorted(set(args.image_formats) - set(IMAGE_QUALITY))
+    if unknown:
+        parser.error(f"--image-formats: unsupported format(s) {', '.join(unknown)} (known: {', '.join(IMAGE_QUALITY)})")
+    # Fragments and the search index are derived from the citation data. When
+    # that is redirected (tests, benchmarks, other sites), their outputs
+    # follow it instead of falling back to (and pruning) the site tree.
+    citations_dest = args.publication_citations_dest
+    if citations_dest.resolve() == DEFAULT_PUBLICATION_CITATIONS_DEST.resolve():
+        defaults = (DEFAULT_FRAGMENTS_DIR, DEFAULT_FRAGMENT_MANIFEST, DEFAULT_SEARCH_INDEX_DIR)
+    else:
+        defaults = (
+            citations_dest.parent / f"{citations_dest.stem}-fragments",
+            citations_dest.parent / f"{citations_dest.stem}-fragments.json",
+            citations_dest.parent / f"{citations_dest.stem}-search",
+        )
+    args.fragments_dir = args.fragments_dir or defaults[0]
+    args.fragment_manifest = args.fragment_manifest or defaults[1]
+    args.search_index_dir = args.search_index_dir or defaults[2]
+    return args
+
+
+def write_metrics_report(
+    path: Path,
+    metrics: SyncMetrics,
+    status: str,
+    task_report: TaskGraphReport | None,
+    rate_limits: dict[str, dict[str, float]] | None = None,
+) -> None:
+    report = {"status": status, **metrics.report()}
+    if task_report is not None:
+        report["task_graph"] = task_report.to_dict()
+    if rate_limits:
+        report["rate_limits"] = rate_limits
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str]) -> int:
+    # Stage modules are imported only on the paths that use them: a CV-only
+    # run from a local file never loads the HTTP client or the XML parser.
+    args = parse_args(argv)
+    if args.watch:
+        from .cv import watch_cv
+
+        try:
+            watch_cv(args.cv_source_file, args.cv_tex_dest, args.cv_data_dest)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    run_cv = not args.batch and not args.skip_cv and not args.fragments_only
+    run_publications = not args.batch and not args.skip_publications and not args.fragments_only
+    run_enrichment = args.enrich
+    # Fragments only read local files; --fragments-only refreshes them
+    # offline, e.g. after editing publication_meta.yml.
+    run_fragments = (run_publications or args.fragments_only) and not args.no_fragments
+    run_search_index = run_publications and not args.no_search_index
+    run_images = args.images
+    needs_network = bool(args.batch) or run_publications or run_enrichment or (run_cv and not args.cv_source_file)
+    configure_fingerprints(None if args.no_fingerprints else args.fingerprint_dir)
+    metrics = reset_metrics()
+    # URLError is an OSError; XML parse errors are added once the parser is loaded.
+    handled_errors: tuple[type[Exception], ...] = (OSError, ValueError)
+    cache = None
+    if needs_network:
+        from xml.etree.ElementTree import ParseError
+
+        from . import net
+
+        # Recording bypasses the cache so the archive holds full bodies rather
+        # than 304 revalidations of whatever happened to be cached; replaying
+        # does too, so answers come only from the archive and the live cache
+        # is left untouched.
+        net.configure_http_fixtures(args.record, args.replay)
+        cache = net.configure_http_cache(None if args.no_cache or args.record or args.replay else args.cache_dir)
+        net.configure_dblp_base_url(args.dblp_base_url)
+        handled_errors += (ParseError,)
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    status = "ok"
+    task_report = None
+    rate_limits = None
+
+    if profiler:
+        profiler.enable()
+    try:
+        if args.batch:
+            from .batch import load_batch_manifest, sync_batch
+
+            members = load_batch_manifest(args.batch, args.state_file.parent)
+            summaries = sync_batch(
+                members,
+                workers=args.batch_workers,
+                max_concurrency=args.max_concurrency,
+                bulk_bibtex=not args.no_bulk_bibtex,
+                full_sync=args.full_sync,
+                cache_dir=None if args.no_cache or args.record else args.cache_dir,
+                fingerprint_dir=None if args.no_fingerprints else args.fingerprint_dir,
+                dblp_base_url=args.dblp_base_url,
+                record_dir=args.record,
+                replay_dir=args.replay,
+            )
+            for summary in summaries:
+                details = [
+                    f"{label}={summary[field]}"
+                    for field, label in (
+                        ("cv_data_changed", "cv"),
+                        ("publications", "pubs"),
+                        ("bib_changed", "bib"),
+                        ("citations_changed", "citations"),
+                    )
+                    if field in summary
+                ]
+                print(f"[batch] {summary['name']}: {' '.join(details)}")
+            print(
+                f"[batch] {len(summaries)} members, "
+                f"{int(metrics.counters.get('batch.bibtex_unique', 0))} distinct BibTeX records for "
+                f"{int(metrics.counters.get('batch.bibtex_requested', 0))} requested"
+            )
+
+        if run_cv or run_publications or run_enrichment or run_fragments or run_search_index or run_images:
+            # CV and publication stages share no inputs, so they run as one
+            # dependency graph; the report names the chain that bounded the run.
+            graph = TaskGraph()
+            if run_cv:
+                from .cv import add_cv_tasks
+
+                cv_run = add_cv_tasks(
+                    graph,
+                    cv_source_file=args.cv_source_file,
+                    cv_repo=args.cv_repo,
+                    cv_branch=args.cv_branch,
+                    cv_tex_dest=args.cv_tex_dest,
+                    cv_data_dest=args.cv_data_dest,
+                )
+            if run_publications:
+                from .publications import add_publication_tasks
+
+                pub_run = add_publication_tasks(
+                    graph,
+                    dblp_pid=args.dblp_pid,
+                    bib_dest=args.bib_dest,
+                    citation_data_dest=args.publication_citations_dest,
+                    max_concurrency=args.max_concurrency,
+                    bulk_bibtex=not args.no_bulk_bibtex,
+                    state_path=args.state_file,
+                    full_sync=args.full_sync,
+                )
+            if run_fragments:
+                from .fragments import add_fragment_tasks
+
+                fragment_run = add_fragment_tasks(
+                    graph,
+                    citation_data_path=args.publication_citations_dest,
+                    bib_path=args.bib_dest,
+                    meta_path=args.publication_meta,
+                    fragments_dir=args.fragments_dir,
+                    manifest_path=args.fragment_manifest,
+                    after=("pubs.record",) if run_publications else (),
+                )
+            if run_search_index:
+                from .searchindex import add_search_index_tasks
+
+                search_run = add_search_index_tasks(
+                    graph,
+                    citation_data_path=args.publication_citations_dest,
+                    index_dir=args.search_index_dir,
+                    after=("pubs.record",),
+                )
+            if run_enrichment:
+                from .enrichment import add_enrichment_tasks, make_provider
+
+                # Enriches the bibliography as written by this run, or the
+                # existing one with --skip-publications.
+                enrich_run = add_enrichment_tasks(
+                    graph,
+                    bib_path=args.bib_dest,
+                    dest=args.enrichment_dest,
+                    provider=make_provider(args.enrichment_provider, args.enrichment_base_url),
+                    cache_path=None if args.no_cache or args.record else args.enrichment_cache,
+                    ttl_hours=args.enrichment_ttl_hours,
+                    after=("pubs.record",) if run_publications else (),
+                )
+            if run_images:
+                from .images import add_image_tasks
+
+                # Independent of every other stage.
+                image_run = add_image_tasks(
+                    graph,
+                    source_dir=args.image_dir,
+                    output_dir=args.image_output_dir,
+                    manifest_path=args.image_manifest,
+                    site_root=args.site_root,
+                    widths=args.image_widths,
+                    formats=args.image_formats,
+                )
+            with metrics.phase("stages"):
+                task_report = graph.run(1 if profiler else DEFAULT_TASK_WORKERS)
+
+            if run_cv:
+                print(f"[cv] tex updated: {cv_run.tex_changed}")
+                print(f"[cv] data updated: {cv_run.data_changed}")
+            if run_publications:
+                changeset = pub_run.changeset
+                print(f"[pubs] selected publications: {pub_run.total}")
+                print(f"[pubs] bib updated: {pub_run.bib_changed}")
+                print(f"[pubs] citation data updated: {pub_run.citation_changed}")
+                print(
+                    f"[pubs] changes: {len(changeset.added)} added, "
+                    f"{len(changeset.updated)} updated, {len(changeset.removed)} removed"
+                )
+                for key, fields in changeset.fields.items():
+                    print(f"[pubs] updated {key}: {', '.join(fields) or 'formatting only'}")
+                if args.changeset:
+                    from .files import write_if_changed
+
+                    write_if_changed(args.changeset, json.dumps(changeset.to_dict(), indent=2) + "\n")
+            if run_fragments:
+                print(
+                    f"[fragments] {len(fragment_run.manifest)} publications: "
+                    f"{len(fragment_run.rendered)} rendered, {len(fragment_run.removed)} removed"
+                )
+            if run_search_index:
+                print(
+                    f"[search] {search_run.documents} publications, {search_run.tokens} tokens in "
+                    f"{len(search_run.shards)} shards: "
+                    + ("rebuilt" if search_run.rebuilt else "unchanged")
+                    + (f", updated: {search_run.changed}" if search_run.rebuilt else "")
+                )
+            if run_enrichment:
+                print(
+                    f"[enrich] {len(enrich_run.papers)} papers: {enrich_run.cached} cached, "
+                    f"{enrich_run.fetched} looked up in {enrich_run.requests} requests"
+                    + (" (provider unavailable, kept cached values)" if enrich_run.failed else "")
+                )
+                print(f"[enrich] data updated: {enrich_run.changed}")
+            if run_images:
+                if not image_run.encoder:
+                    print("[images] no image encoder found (install ImageMagick); kept existing variants")
+                print(
+                    f"[images] {len(image_run.images)} images: {len(image_run.encoded)} encoded, "
+                    f"{image_run.reused} unchanged, {len(image_run.removed)} stale variants removed"
+                    + (f", {len(image_run.failed)} problems" if image_run.failed else "")
+                )
+                print(f"[images] manifest updated: {image_run.manifest_changed}")
+            print(f"[tasks] critical path: {task_report.describe_critical_path()}")
+
+        if cache:
+            cache.prune(HTTP_CACHE_MAX_AGE_SECONDS, HTTP_CACHE_MAX_BYTES)
+
+    except handled_errors as error:
+        print(f"sync failed: {error}", file=sys.stderr)
+        status = "failed"
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(str(args.profile))
+        if needs_network:
+            net.close_http_client()
+            rate_limits = net.rate_limiter_snapshot()
+
+    if args.metrics:
+        write_metrics_report(args.metrics, metrics, status, task_report, rate_limits)
+        counters = metrics.counters
+        print(
+            f"[metrics] {metrics.report()['wall_seconds']:.3f}s wall, "
+            f"{int(counters.get('http.requests', 0))} requests, "
+            f"{int(counters.get('http.wire_bytes', 0))} bytes, "
+            f"{counters.get('fetch.backoff_seconds', 0):.1f}s backoff, "
+            f"{int(counters.get('http.throttled', 0))} throttled, "
+            f"{counters.get('http.limiter_wait_seconds', 0):.1f}s rate-limit wait"
+        )
+    return 0 if status == "ok" else 1
@@ -0,0 +1,78 @@
+"""Default paths, endpoints and limits shared by the sync stages."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_CV_TEX_DEST = ROOT / "assets" / "cv" / "main.tex"
+DEFAULT_CV_DATA_DEST = ROOT / "_data" / "cv.yml"
+DEFAULT_BIB_DEST = ROOT / "_bibliography" / "papers.bib"
+DEFAULT_PUBLICATION_CITATIONS_DEST = ROOT / "_data" / "publication_citations.json"
+DEFAULT_PUBLICATION_ENRICHMENT_DEST = ROOT / "_data" / "publication_enrichment.json"
+DEFAULT_PUBLICATION_META = ROOT / "_data" / "publication_meta.yml"
+DEFAULT_FRAGMENTS_DIR = ROOT / "_includes" / "publications"
+DEFAULT_FRAGMENT_MANIFEST = ROOT / "_data" / "publication_fragments.json"
+DEFAULT_SEARCH_INDEX_DIR = ROOT / "assets" / "json" / "publication-search"
+DEFAULT_IMAGE_SOURCE_DIR = ROOT / "assets" / "img"
+DEFAULT_IMAGE_OUTPUT_DIR = ROOT / "assets" / "img" / "responsive"
+DEFAULT_IMAGE_MANIFEST = ROOT / "_data" / "responsive_images.json"
+
+DEFAULT_CV_REPO = "Iacob-Alexandru-Andrei/Standard_CV_2023"
+DEFAULT_CV_BRANCH = "main"
+DEFAULT_DBLP_PID = "346/2270"
+DEFAULT_DBLP_BASE_URL = "https://dblp.org"
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_BATCH_WORKERS = os.cpu_count() or 2
+# Threads for independent sync stages (CV vs. publications, output writes).
+DEFAULT_TASK_WORKERS = 8
+
+DEFAULT_HTTP_CACHE_DIR = ROOT / ".cache" / "sync-http"
+HTTP_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_SYNC_STATE_PATH = ROOT / ".cache" / "publication-sync-state.json"
+DEFAULT_FINGERPRINT_DIR = ROOT / ".cache" / "sync-fingerprints"
+# Bump when entry processing changes so stale state is not reused.
+SYNC_STATE_VERSION = 3
+# Bump when the fragment markup changes so every fragment is re-rendered.
+FRAGMENT_FORMAT_VERSION = 1
+# Bump when tokenization or the index layout changes.
+SEARCH_INDEX_VERSION = 1
+# Indexes with fewer distinct tokens are written as a single shard.
+SEARCH_INDEX_SHARD_MIN_TOKENS = 2000
+
+# Responsive image variants: target widths (capped at the source width),
+# extra formats offered via <source> ahead of the re-encoded original format,
+# and encoder quality per format. Bump IMAGE_FORMAT_VERSION when the encoder
+# settings change so every image is re-encoded.
+IMAGE_WIDTHS = (480, 960, 1440)
+IMAGE_FORMATS = ("webp",)
+IMAGE_QUALITY = {"avif": 50, "webp": 78, "jpeg": 80}
+IMAGE_FORMAT_VERSION = 1
+DEFAULT_IMAGE_WORKERS = os.cpu_count() or 2
+
+DEFAULT_ENRICHMENT_CACHE_PATH = ROOT / ".cache" / "publication-enrichment.json"
+DEFAULT_ENRICHMENT_PROVIDER = "semantic-scholar"
+DEFAULT_SEMANTIC_SCHOLAR_BASE_URL = "https://api.semanticscholar.org"
+# Citation counts move slowly; refresh them weekly rather than on every sync.
+DEFAULT_ENRICHMENT_TTL_HOURS = 7 * 24
+
+WATCH_POLL_SECONDS = 0.05
+
+HTTP_TIMEOUT_SECONDS = 30
+HTTP_MAX_IDLE_PER_HOST = 8
+HTTP_MAX_REDIRECTS = 5
+
+# Per-host request scheduling (see ratelimit.HostRateLimiter): a token bucket
+# of HTTP_HOST_RATE requests/s and an AIMD window of in-flight requests, both
+# halved on 429/503 and grown back by every successful response.
+HTTP_HOST_RATE = 10.0
+HTTP_HOST_BURST = 10.0
+HTTP_HOST_MIN_RATE = 0.5
+HTTP_HOST_RATE_STEP = 0.5
+HTTP_HOST_INITIAL_WINDOW = 4.0
+HTTP_HOST_MAX_WINDOW = 16.0
+HTTP_HOST_MAX_PAUSE_SECONDS = 120.0
@@ -0,0 +1,308 @@
+"""CV extraction from the LaTeX source into _data/cv.yml."""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .config import WATCH_POLL_SECONDS
+from .files import write_chunks_if_changed, write_if_changed
+from .fingerprints import input_fingerprint, lookup_stage, record_stage
+from .latex import latex_to_plain
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+from .tex import TexSection, find_section_headings, index_tex_sections, strip_tex_comments
+
+
+def parse_itemize_items(text: str) -> list[str]:
+    items: list[str] = []
+    for match in re.finditer(r"\\item\s*(.+?)(?=(?:\\item|\\end\{itemize\}))", text, flags=re.S):
+        value = latex_to_plain(match.group(1))
+        if value:
+            items.append(value)
+    return items
+
+
+def split_csv_like(text: str) -> list[str]:
+    parts: list[str] = []
+    cursor: list[str] = []
+    depth = 0
+    for ch in text:
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth = max(depth - 1, 0)
+        if ch == "," and depth == 0:
+            part = "".join(cursor).strip()
+            if part:
+                parts.append(part)
+            cursor = []
+            continue
+        cursor.append(ch)
+    tail = "".join(cursor).strip()
+    if tail:
+        parts.append(tail)
+    plain_parts = (latex_to_plain(part) for part in parts)
+    return [part for part in plain_parts if part]
+
+
+def publication_lines(section: TexSection | None) -> list[str]:
+    lines: list[str] = []
+    if section is None:
+        return lines
+    for command in section.iter_commands("cvitem"):
+        args = command.args
+        if len(args) < 2:
+            continue
+        label = latex_to_plain(args[0])
+        text = latex_to_plain(args[1])
+        if label and text:
+            lines.append(f"{label}: {text}")
+        elif text:
+            lines.append(text)
+    return lines
+
+
+def extract_education(section: TexSection | None) -> list[dict[str, Any]]:
+    education: list[dict[str, Any]] = []
+    for command in section.iter_commands("edentry") if section else []:
+        args = command.args
+        if len(args) < 6:
+            continue
+        entry = {
+            "period": latex_to_plain(args[0]),
+            "degree": latex_to_plain(args[1]),
+            "institution": latex_to_plain(args[2]),
+            "details": parse_itemize_items(args[5]),
+        }
+        education.append(entry)
+    return education
+
+
+def extract_experience(section: TexSection | None) -> list[dict[str, Any]]:
+    experience: list[dict[str, Any]] = []
+    for command in section.iter_commands("cventry") if section else []:
+        args = command.args
+        if len(args) < 6:
+            continue
+        entry = {
+            "period": latex_to_plain(args[0]),
+            "role": latex_to_plain(args[1]),
+            "organization": latex_to_plain(args[2]),
+            "bullets": parse_itemize_items(args[5]),
+        }
+        experience.append(entry)
+    return experience
+
+
+def extract_skills(section: TexSection | None) -> list[dict[str, Any]]:
+    skills: list[dict[str, Any]] = []
+    for command in section.iter_commands("cvitem") if section else []:
+        args = command.args
+        if len(args) < 2:
+            continue
+        entry = {
+            "category": latex_to_plain(args[0]),
+            "items": split_csv_like(args[1]),
+        }
+        skills.append(entry)
+    return skills
+
+
+# cv.yml field -> (LaTeX section title, extractor), in output order.
+CV_SECTION_EXTRACTORS: dict[str, tuple[str, Callable[[TexSection | None], Any]]] = {
+    "education": ("Education", extract_education),
+    "experience": ("Work Experience", extract_experience),
+    "skills": ("Technical Skills", extract_skills),
+    "selected_publications": ("Selected Publications", publication_lines),
+    "extended_publications": ("Extended Publications", publication_lines),
+}
+
+
+def extract_cv_data(tex: str) -> dict[str, Any]:
+    sections = index_tex_sections(strip_tex_comments(tex))
+    return {field: extractor(sections.get(title)) for field, (title, extractor) in CV_SECTION_EXTRACTORS.items()}
+
+
+# Keeps the last extracted value of every cv.yml field keyed by the source
+# text of its section, so re-extraction after an edit only re-parses the
+# sections whose text changed.
+class IncrementalCvExtractor:
+    def __init__(self) -> None:
+        self._fields: dict[str, tuple[str, Any]] = {}
+        self.reparsed: list[str] = []
+
+    def extract(self, tex: str) -> dict[str, Any]:
+        source = strip_tex_comments(tex)
+        headings = find_section_headings(source)
+        section_text: dict[str, str] = {}
+        for heading_index, (pos, _, title) in enumerate(headings):
+            end = headings[heading_index + 1][0] if heading_index + 1 < len(headings) else len(source)
+            section_text.setdefault(title, source[pos:end])
+
+        data: dict[str, Any] = {}
+        self.reparsed = []
+        for field, (title, extractor) in CV_SECTION_EXTRACTORS.items():
+            text = section_text.get(title, "")
+            cached = self._fields.get(field)
+            if cached is not None and cached[0] == text:
+                data[field] = cached[1]
+                continue
+            value = extractor(index_tex_sections(text).get(title))
+            self._fields[field] = (text, value)
+            data[field] = value
+            self.reparsed.append(field)
+        return data
+
+
+def render_yaml_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value)
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def iter_yaml_lines(value: Any, indent: int = 0) -> Iterator[str]:
+    # Yields newline-terminated lines so callers can stream them to disk.
+    prefix = " " * indent
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                yield f"{prefix}{key}:\n"
+                yield from iter_yaml_lines(item, indent + 2)
+            else:
+                yield f"{prefix}{key}: {render_yaml_scalar(item)}\n"
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)):
+                yield f"{prefix}-\n"
+                yield from iter_yaml_lines(item, indent + 2)
+            else:
+                yield f"{prefix}- {render_yaml_scalar(item)}\n"
+    else:
+        yield f"{prefix}{render_yaml_scalar(value)}\n"
+
+
+def dump_yaml(value: Any, indent: int = 0) -> str:
+    return "".join(iter_yaml_lines(value, indent))
+
+
+def iter_cv_yaml(cv_data: dict[str, Any]) -> Iterator[str]:
+    yield "# Auto-generated from assets/cv/main.tex by scripts/sync_cv_and_publications.py.\n"
+    yield "# Do not edit this file manually; edit the LaTeX CV source instead.\n"
+    yield "\n"
+    yield from iter_yaml_lines(cv_data)
+
+
+# State shared by the CV stages of one task graph.
+@dataclass
+class CvRun:
+    tex: str = ""
+    fingerprint: str = ""
+    skipped: bool = False
+    cv_data: dict[str, Any] | None = None
+    tex_changed: bool = False
+    data_changed: bool = False
+
+
+def add_cv_tasks(
+    graph: TaskGraph,
+    cv_source_file: Path | None,
+    cv_repo: str,
+    cv_branch: str,
+    cv_tex_dest: Path,
+    cv_data_dest: Path,
+) -> CvRun:
+    # fetch_source -> (write_tex | extract -> write_yaml) -> record; every
+    # stage after fetch_source is a no-op when the fingerprint matched.
+    run = CvRun()
+    stage = f"cv:{cv_data_dest.resolve()}"
+    output_paths = [cv_tex_dest, cv_data_dest]
+
+    def fetch_source() -> None:
+        with _metrics.phase("cv.fetch_source"):
+            if cv_source_file:
+                run.tex = cv_source_file.read_text(encoding="utf-8")
+            else:
+                raw_url = f"https://raw.githubusercontent.com/{cv_repo}/{cv_branch}/main.tex"
+                from .net import fetch_text
+
+                run.tex = fetch_text(raw_url)
+        run.fingerprint = input_fingerprint("cv", run.tex)
+        run.skipped = lookup_stage(stage, run.fingerprint, output_paths) is not None
+
+    def write_tex() -> None:
+        if not run.skipped:
+            run.tex_changed = write_if_changed(cv_tex_dest, run.tex)
+
+    def extract() -> None:
+        if not run.skipped:
+            with _metrics.phase("cv.extract"):
+                run.cv_data = extract_cv_data(run.tex)
+
+    def write_yaml() -> None:
+        if run.cv_data is not None:
+            with _metrics.phase("cv.dump_yaml"):
+                run.data_changed = write_chunks_if_changed(cv_data_dest, iter_cv_yaml(run.cv_data))
+
+    def record() -> None:
+        if not run.skipped:
+            record_stage(stage, run.fingerprint, output_paths)
+
+    graph.add("cv.fetch_source", fetch_source)
+    graph.add("cv.write_tex", write_tex, ("cv.fetch_source",))
+    graph.add("cv.extract", extract, ("cv.fetch_source",))
+    graph.add("cv.write_yaml", write_yaml, ("cv.extract",))
+    graph.add("cv.record", record, ("cv.write_tex", "cv.write_yaml"))
+    return run
+
+
+def sync_cv(
+    cv_source_file: Path | None,
+    cv_repo: str,
+    cv_branch: str,
+    cv_tex_dest: Path,
+    cv_data_dest: Path,
+) -> tuple[bool, bool]:
+    graph = TaskGraph()
+    run = add_cv_tasks(graph, cv_source_file, cv_repo, cv_branch, cv_tex_dest, cv_data_dest)
+    graph.run()
+    return run.tex_changed, run.data_changed
+
+
+def watch_cv(cv_source_file: Path, cv_tex_dest: Path, cv_data_dest: Path, poll_seconds: float = WATCH_POLL_SECONDS) -> None:
+    # Polls the source's mtime/size (editors often save by rename, so the
+    # file may briefly disappear) and rewrites outputs only when they differ.
+    extractor = IncrementalCvExtractor()
+    last_signature: tuple[int, int] | None = None
+    print(f"[watch] watching {cv_source_file} (Ctrl-C to stop)", flush=True)
+    while True:
+        try:
+            stat = cv_source_file.stat()
+        except FileNotFoundError:
+            time.sleep(poll_seconds)
+            continue
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != last_signature:
+            last_signature = signature
+            start = time.perf_counter()
+            try:
+                tex = cv_source_file.read_text(encoding="utf-8")
+                write_if_changed(cv_tex_dest, tex)
+                data_changed = write_chunks_if_changed(cv_data_dest, iter_cv_yaml(extractor.extract(tex)))
+            except (OSError, ValueError) as error:
+                print(f"[watch] skipped update: {error}", file=sys.stderr)
+            else:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                reparsed = ", ".join(extractor.reparsed) or "none"
+                print(f"[watch] {elapsed_ms:.1f} ms, data updated: {data_changed}, re-parsed: {reparsed}", flush=True)
+        time.sleep(poll_seconds)
@@ -0,0 +1,259 @@
+"""DBLP profile parsing, version clustering and website key selection."""
+
+from __future__ import annotations
+
+import math
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .latex import latex_to_plain
+from .net import dblp_url, fetch_text
+from .overrides import TITLE_KEY_OVERRIDES, WORK_TITLE_SIMILARITY
+
+
+@dataclass(frozen=True)
+class DblpCandidate:
+    dblp_key: str
+    entry_type: str
+    title: str
+    year: int
+    venue: str
+    rank: int
+    level: str
+    mdate: str = ""
+
+
+def normalize_for_key(text: str) -> str:
+    plain = latex_to_plain(text).lower()
+    plain = re.sub(r"[^a-z0-9]+", "", plain)
+    return plain
+
+
+def slugify(text: str) -> str:
+    slug = latex_to_plain(text).lower()
+    slug = slug.replace("&", " and ")
+    slug = re.sub(r"[^a-z0-9]+", "-", slug)
+    slug = re.sub(r"-+", "-", slug).strip("-")
+    return slug
+
+
+def publication_level(entry_type: str, venue: str) -> tuple[int, str]:
+    lowered = venue.lower()
+    if "corr" in lowered or "arxiv" in lowered:
+        return 1, "arxiv"
+    if entry_type == "inproceedings":
+        if "workshop" in lowered or "@" in venue:
+            return 2, "workshop"
+        return 3, "conference"
+    if entry_type == "article":
+        return 3, "journal"
+    return 2, "other"
+
+
+def work_identifier(title: str) -> str:
+    plain = latex_to_plain(title).strip().rstrip(".")
+    if ":" in plain:
+        prefix = plain.split(":", 1)[0]
+        normalized_prefix = normalize_for_key(prefix)
+        if normalized_prefix:
+            return normalized_prefix
+    return normalize_for_key(plain)
+
+
+def candidate_from_record(record: ET.Element) -> DblpCandidate | None:
+    key = record.attrib.get("key", "").strip()
+    mdate = record.attrib.get("mdate", "").strip()
+    title = (record.findtext("title") or "").strip()
+    year_text = (record.findtext("year") or "").strip()
+    venue = (record.findtext("booktitle") or record.findtext("journal") or "").strip()
+    if not key or not title or not year_text:
+        return None
+    try:
+        year = int(year_text)
+    except ValueError:
+        return None
+    rank, level = publication_level(record.tag, venue)
+    return DblpCandidate(
+        dblp_key=key,
+        entry_type=record.tag,
+        title=title,
+        year=year,
+        venue=venue,
+        rank=rank,
+        level=level,
+        mdate=mdate,
+    )
+
+
+def iter_dblp_candidates(chunks: Iterable[str]) -> Iterator[DblpCandidate]:
+    # Incremental parse of <dblpperson><r><record/></r>...</dblpperson> fed in
+    # chunks, without building the full tree: each top-level child is cleared
+    # once it has been consumed, so the parser's own memory stays bounded by
+    # the largest single record.
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root: ET.Element | None = None
+    depth = 0
+    in_container = False
+    record_seen = False
+
+    def drain() -> Iterator[DblpCandidate]:
+        nonlocal root, depth, in_container, record_seen
+        for event, element in parser.read_events():
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = element
+                elif depth == 2:
+                    in_container = element.tag == "r"
+                    record_seen = False
+                continue
+            if depth == 3 and in_container and not record_seen:
+                record_seen = True
+                candidate = candidate_from_record(element)
+                if candidate is not None:
+                    yield candidate
+            elif depth == 2 and root is not None:
+                root.clear()
+            depth -= 1
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def iter_text_chunks(text: str, size: int = 1 << 16) -> Iterator[str]:
+    # Splits an already buffered body into parser-sized chunks.
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def fetch_dblp_profile(pid: str) -> str:
+    return fetch_text(dblp_url(f"pid/{pid}.xml"))
+
+
+def fetch_dblp_candidates(pid: str) -> Iterator[DblpCandidate]:
+    # Incremental parse of a buffered body: the HTTP cache, revalidation,
+    # fixtures and input fingerprints all need the whole profile text, so it
+    # is downloaded in full and only the parse avoids a full tree.
+    return iter_dblp_candidates(iter_text_chunks(fetch_dblp_profile(pid)))
+
+
+def trigram_shingles(text: str) -> frozenset[str]:
+    return frozenset(text[index : index + 3] for index in range(max(len(text) - 2, 1)))
+
+
+def title_similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    overlap = len(left & right)
+    return overlap / (len(left) + len(right) - overlap) if overlap else 0.0
+
+
+def similar_pairs(shingle_sets: list[frozenset[str]], threshold: float) -> Iterator[tuple[int, int]]:
+    # Prefix-filtered similarity join (PPJoin). With shingles ordered rarest
+    # first, two sets with Jaccard >= threshold must share a shingle within the
+    # first |x| - ceil(threshold * |x|) + 1 of each, so only those prefixes go
+    # into the inverted index. Sets are visited smallest first, partners
+    # shorter than threshold * |x| are skipped, and a partner is dropped as
+    # soon as the positions of the shared shingles rule out enough overlap.
+    frequency: dict[str, int] = {}
+    for shingles in shingle_sets:
+        for shingle in shingles:
+            frequency[shingle] = frequency.get(shingle, 0) + 1
+    index: dict[str, list[tuple[int, int]]] = {}
+    for position in sorted(range(len(shingle_sets)), key=lambda item: len(shingle_sets[item])):
+        shingles = shingle_sets[position]
+        size = len(shingles)
+        ordered = sorted(shingles, key=lambda shingle: (frequency[shingle], shingle))
+        prefix_length = size - math.ceil(threshold * size - 1e-9) + 1
+        overlaps: dict[int, int] = {}
+        for offset, shingle in enumerate(ordered[:prefix_length]):
+            postings = index.setdefault(shingle, [])
+            for other, other_offset in postings:
+                overlap = overlaps.get(other, 0)
+                if overlap < 0:
+                    continue
+                other_size = len(shingle_sets[other])
+                if other_size < threshold * size:
+                    overlaps[other] = -1
+                    continue
+                required = math.ceil(threshold / (1 + threshold) * (size + other_size) - 1e-9)
+                if overlap + 1 + min(size - offset - 1, other_size - other_offset - 1) >= required:
+                    overlaps[other] = overlap + 1
+                else:
+                    overlaps[other] = -1
+            postings.append((position, offset))
+        for other, overlap in overlaps.items():
+            if overlap > 0 and title_similarity(shingles, shingle_sets[other]) >= threshold:
+                yield other, position
+
+
+def cluster_work_versions(candidates: list[DblpCandidate], threshold: float = WORK_TITLE_SIMILARITY) -> list[int]:
+    # Versions share an exact work_identifier (normalized title prefix) or a
+    # near-identical normalized full title with the same numbers in it ("Part
+    # 1" and "Part 2" stay apart); returns a cluster id per candidate.
+    parent = list(range(len(candidates)))
+
+    def find(item: int) -> int:
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(left: int, right: int) -> None:
+        left, right = find(left), find(right)
+        if left != right:
+            parent[max(left, right)] = min(left, right)
+
+    first_by_identifier: dict[str, int] = {}
+    first_by_title: dict[str, int] = {}
+    for position, candidate in enumerate(candidates):
+        union(first_by_identifier.setdefault(work_identifier(candidate.title), position), position)
+        union(first_by_title.setdefault(normalize_for_key(candidate.title), position), position)
+
+    # Titles are only joined within blocks that share the same numbers.
+    blocks: dict[tuple[str, ...], list[str]] = {}
+    for title in first_by_title:
+        blocks.setdefault(tuple(re.findall(r"\d+", title)), []).append(title)
+    for titles in blocks.values():
+        if len(titles) < 2:
+            continue
+        for left, right in similar_pairs([trigram_shingles(title) for title in titles], threshold):
+            union(first_by_title[titles[left]], first_by_title[titles[right]])
+    return [find(position) for position in range(len(candidates))]
+
+
+def select_highest_level_publications(candidates: Iterable[DblpCandidate]) -> list[DblpCandidate]:
+    candidates = list(candidates)
+    best: dict[int, tuple[tuple[int, int, int], DblpCandidate]] = {}
+    for key, candidate in zip(cluster_work_versions(candidates), candidates):
+        score = (
+            candidate.rank,
+            candidate.year,
+            1 if candidate.entry_type == "inproceedings" else 0,
+        )
+        current = best.get(key)
+        if current is None or score > current[0]:
+            best[key] = (score, candidate)
+    selected = [item[1] for item in best.values()]
+    selected.sort(key=lambda item: (item.year, latex_to_plain(item.title).lower()), reverse=True)
+    return selected
+
+
+def choose_publication_key(title: str, year: int, used: set[str]) -> str:
+    override_key = TITLE_KEY_OVERRIDES.get(normalize_for_key(title))
+    if override_key:
+        base_key = override_key
+    else:
+        base_slug = slugify(title)
+        base_key = f"{base_slug}-{year}" if year else base_slug
+
+    key = base_key
+    index = 2
+    while key in used:
+        key = f"{base_key}-{index}"
+        index += 1
+    used.add(key)
+    return key
@@ -0,0 +1,239 @@
+"""Citation counts and external paper IDs from batched metadata lookups."""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from .bibtex import BibtexRecord, iter_bibtex_records
+from .config import DEFAULT_ENRICHMENT_TTL_HOURS, DEFAULT_SEMANTIC_SCHOLAR_BASE_URL
+from .files import write_if_changed
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+
+ARXIV_DOI_RE = re.compile(r"^10\.48550/arxiv\.(.+)$", re.I)
+ARXIV_URL_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([^\s/?#]+?)(?:v\d+)?(?:\.pdf)?(?:[?#]|$)")
+OPENREVIEW_URL_RE = re.compile(r"openreview\.net/(?:forum|pdf)\?id=([\w-]+)")
+
+ENRICHMENT_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PaperIds:
+    key: str
+    doi: str = ""
+    arxiv: str = ""
+    openreview: str = ""
+
+    def to_dict(self) -> dict[str, str]:
+        ids = {"doi": self.doi, "arxiv": self.arxiv, "openreview": self.openreview}
+        return {name: value for name, value in ids.items() if value}
+
+
+def paper_ids(record: BibtexRecord) -> PaperIds:
+    # Identifiers already present in the DBLP record: the DOI, the arXiv id
+    # (eprint field, arXiv DOI or abs/pdf URL) and the OpenReview forum id.
+    doi = record.field("doi")
+    url = record.field("url")
+    arxiv = ""
+    if "arxiv" in {record.field("eprinttype").lower(), record.field("archiveprefix").lower()}:
+        arxiv = record.field("eprint")
+    for match in (ARXIV_DOI_RE.match(doi), ARXIV_URL_RE.search(url)):
+        if not arxiv and match:
+            arxiv = match.group(1)
+    openreview = OPENREVIEW_URL_RE.search(url)
+    return PaperIds(record.key, doi=doi, arxiv=arxiv, openreview=openreview.group(1) if openreview else "")
+
+
+# A metadata service queried in batches. lookup_id() maps a paper to the
+# provider's identifier (None when the paper has nothing to look up by);
+# fetch_batch() resolves up to batch_size identifiers in one request and
+# returns a record per identifier, or None for papers the service does not
+# know. Records use the output field names (citation_count, arxiv, doi, ...).
+class MetadataProvider(abc.ABC):
+    name = ""
+    batch_size = 100
+
+    @abc.abstractmethod
+    def lookup_id(self, paper: PaperIds) -> str | None: ...
+
+    @abc.abstractmethod
+    def fetch_batch(self, lookup_ids: list[str]) -> dict[str, dict[str, Any] | None]: ...
+
+
+# Semantic Scholar Graph API: POST /graph/v1/paper/batch resolves up to 500
+# "ARXIV:<id>" / "DOI:<doi>" identifiers per request and answers null for
+# unknown ones. SEMANTIC_SCHOLAR_API_KEY raises the unauthenticated rate limit.
+class SemanticScholarProvider(MetadataProvider):
+    name = "semantic-scholar"
+    batch_size = 500
+    fields = "citationCount,externalIds"
+
+    def __init__(self, base_url: str | None = None, api_key: str | None = None) -> None:
+        self.base_url = (base_url or DEFAULT_SEMANTIC_SCHOLAR_BASE_URL).rstrip("/")
+        self.api_key = os.environ.get("SEMANTIC_SCHOLAR_API_KEY", "") if api_key is None else api_key
+
+    def lookup_id(self, paper: PaperIds) -> str | None:
+        if paper.arxiv:
+            return f"ARXIV:{paper.arxiv}"
+        if paper.doi:
+            return f"DOI:{paper.doi}"
+        return None
+
+    def fetch_batch(self, lookup_ids: list[str]) -> dict[str, dict[str, Any] | None]:
+        from .net import post_json
+
+        url = f"{self.base_url}/graph/v1/paper/batch?fields={self.fields}"
+        items = post_json(url, {"ids": lookup_ids}, {"x-api-key": self.api_key} if self.api_key else None)
+        if not isinstance(items, list) or len(items) != len(lookup_ids):
+            raise ValueError(f"Unexpected batch response from {url}")
+        results: dict[str, dict[str, Any] | None] = {}
+        for lookup_id, item in zip(lookup_ids, items):
+            if not isinstance(item, dict):
+                results[lookup_id] = None
+                continue
+            external = item.get("externalIds") or {}
+            results[lookup_id] = {
+                "citation_count": item.get("citationCount"),
+                "semantic_scholar": item.get("paperId") or "",
+                "arxiv": external.get("ArXiv") or "",
+                "doi": external.get("DOI") or "",
+            }
+        return results
+
+
+ENRICHMENT_PROVIDERS: dict[str, Callable[[str | None], MetadataProvider]] = {
+    SemanticScholarProvider.name: SemanticScholarProvider,
+}
+
+
+def make_provider(name: str, base_url: str | None = None) -> MetadataProvider:
+    factory = ENRICHMENT_PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown enrichment provider: {name} (known: {', '.join(sorted(ENRICHMENT_PROVIDERS))})")
+    return factory(base_url)
+
+
+# Provider answers in one JSON file, keyed by provider and lookup id, with the
+# time each was fetched. Unknown papers are cached as null so they are not
+# re-queried on every run; expired answers still serve as a fallback when the
+# provider is unreachable.
+class EnrichmentCache:
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, dict[str, Any]]] = {}
+        if path is None:
+            return
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == ENRICHMENT_CACHE_VERSION:
+            self.entries = payload.get("providers", {})
+
+    def get(self, provider: str, lookup_id: str) -> dict[str, Any] | None:
+        return self.entries.get(provider, {}).get(lookup_id)
+
+    def put(self, provider: str, lookup_id: str, data: dict[str, Any] | None, fetched_at: float) -> None:
+        self.entries.setdefault(provider, {})[lookup_id] = {"fetched_at": fetched_at, "data": data}
+
+    def save(self, provider: str, keep: set[str]) -> None:
+        # Only the papers still in the bibliography are kept.
+        if self.path is None:
+            return
+        self.entries[provider] = {key: value for key, value in self.entries.get(provider, {}).items() if key in keep}
+        payload = {"version": ENRICHMENT_CACHE_VERSION, "providers": self.entries}
+        write_if_changed(self.path, json.dumps(payload, indent=1, sort_keys=True) + "\n")
+
+
+def enrichment_record(paper: PaperIds, data: dict[str, Any] | None) -> dict[str, Any]:
+    # Identifiers from the BibTeX record win; the provider fills the gaps.
+    record: dict[str, Any] = {name: value for name, value in (data or {}).items() if value not in (None, "")}
+    record.update(paper.to_dict())
+    return dict(sorted(record.items()))
+
+
+# State shared by the enrichment stages of one task graph.
+@dataclass
+class EnrichmentRun:
+    papers: list[PaperIds] = field(default_factory=list)
+    lookup_ids: dict[str, str] = field(default_factory=dict)
+    cache: EnrichmentCache = field(default_factory=lambda: EnrichmentCache(None))
+    cached: int = 0
+    fetched: int = 0
+    requests: int = 0
+    failed: bool = False
+    changed: bool = False
+
+
+def add_enrichment_tasks(
+    graph: TaskGraph,
+    bib_path: Path,
+    dest: Path,
+    provider: MetadataProvider,
+    cache_path: Path | None,
+    ttl_hours: float = DEFAULT_ENRICHMENT_TTL_HOURS,
+    after: tuple[str, ...] = (),
+) -> EnrichmentRun:
+    # collect -> fetch -> write, reading the bibliography written by the
+    # publication stages (listed in after). Only papers whose cached answer
+    # is older than ttl_hours are looked up, batch_size at a time; if the
+    # provider fails, expired answers are kept and the run still succeeds.
+    run = EnrichmentRun()
+
+    def collect() -> None:
+        with _metrics.phase("enrich.collect"):
+            run.papers = [paper_ids(record) for record in iter_bibtex_records(bib_path.read_text(encoding="utf-8"))]
+        for paper in run.papers:
+            lookup_id = provider.lookup_id(paper)
+            if lookup_id:
+                run.lookup_ids[paper.key] = lookup_id
+        run.cache = EnrichmentCache(cache_path)
+
+    def fetch() -> None:
+        now = time.time()
+        stale: list[str] = []
+        for lookup_id in dict.fromkeys(run.lookup_ids.values()):
+            cached = run.cache.get(provider.name, lookup_id)
+            if cached is not None and now - float(cached.get("fetched_at", 0)) < ttl_hours * 3600:
+                run.cached += 1
+            else:
+                stale.append(lookup_id)
+        _metrics.add("enrich.cache_hits", run.cached)
+        with _metrics.phase("enrich.fetch"):
+            for start in range(0, len(stale), provider.batch_size):
+                batch = stale[start : start + provider.batch_size]
+                try:
+                    results = provider.fetch_batch(batch)
+                except (OSError, ValueError) as error:
+                    print(f"[enrich] {provider.name} lookup failed, keeping cached values: {error}", file=sys.stderr)
+                    run.failed = True
+                    break
+                run.requests += 1
+                run.fetched += len(batch)
+                fetched_at = time.time()
+                for lookup_id in batch:
+                    run.cache.put(provider.name, lookup_id, results.get(lookup_id), fetched_at)
+        _metrics.add("enrich.lookups", run.fetched)
+        _metrics.add("enrich.batches", run.requests)
+
+    def write() -> None:
+        payload: dict[str, Any] = {}
+        for paper in run.papers:
+            lookup_id = run.lookup_ids.get(paper.key)
+            cached = run.cache.get(provider.name, lookup_id) if lookup_id else None
+            payload[paper.key] = enrichment_record(paper, cached["data"] if cached else None)
+        run.changed = write_if_changed(dest, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+        run.cache.save(provider.name, set(run.lookup_ids.values()))
+
+    graph.add("enrich.collect", collect, after)
+    graph.add("enrich.fetch", fetch, ("enrich.collect",))
+    graph.add("enrich.write", write, ("enrich.fetch",))
+    return run
@@ -0,0 +1,114 @@
+"""Output writes that skip unchanged content."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from .metrics import _metrics
+
+DIGEST_BLOCK_SIZE = 1 << 16
+# Streamed output is encoded and flushed in blocks of roughly this size.
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Digests of files this process has hashed or written, keyed by path and
+# validated against (mtime_ns, size), so unchanged outputs are not re-read
+# when a fingerprint is checked and then recorded in the same run.
+_digest_cache: dict[str, tuple[int, int, str]] = {}
+_digest_lock = threading.Lock()
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _remember_digest(path: Path, digest: str) -> None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return
+    with _digest_lock:
+        _digest_cache[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def file_digest(path: Path) -> str | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    with _digest_lock:
+        cached = _digest_cache.get(str(path))
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            while block := handle.read(DIGEST_BLOCK_SIZE):
+                digest.update(block)
+    except OSError:
+        return None
+    _remember_digest(path, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def write_chunks_if_changed(path: Path, chunks: Iterable[str]) -> bool:
+    # Chunks are streamed into a temporary file next to `path` and hashed on
+    # the way; the old file is only hashed (block by block) when the sizes
+    # match, and replaced atomically only when the digests differ.
+    start = time.perf_counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            pending: list[str] = []
+            pending_chars = 0
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_chars += len(chunk)
+                if pending_chars >= WRITE_BUFFER_SIZE:
+                    data = "".join(pending).encode("utf-8")
+                    digest.update(data)
+                    handle.write(data)
+                    size += len(data)
+                    pending, pending_chars = [], 0
+            data = "".join(pending).encode("utf-8")
+            digest.update(data)
+            handle.write(data)
+            size += len(data)
+        try:
+            existing = path.stat()
+        except OSError:
+            existing = None
+        unchanged = existing is not None and existing.st_size == size and file_digest(path) == digest.hexdigest()
+        if unchanged:
+            Path(tmp_name).unlink()
+        else:
+            # mkstemp creates the file as 0600; keep the permissions a plain
+            # write would have produced.
+            os.chmod(tmp_name, existing.st_mode & 0o777 if existing is not None else 0o644)
+            os.replace(tmp_name, path)
+            _remember_digest(path, digest.hexdigest())
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    _metrics.record_write(path, size, not unchanged, time.perf_counter() - start)
+    return not unchanged
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    return write_chunks_if_changed(path, (content,))
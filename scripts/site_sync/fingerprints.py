@@ -0,0 +1,83 @@
+"""Input fingerprints that let unchanged stages be skipped."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from .files import file_digest, write_bytes_atomic
+from .metrics import _metrics
+
+
+@functools.cache
+def code_fingerprint() -> str:
+    # Every module of the package, including the override and manual tables,
+    # is hashed from source so fingerprinting never has to import them.
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def input_fingerprint(*parts: str) -> str:
+    digest = hashlib.sha256(code_fingerprint().encode("ascii"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Build cache for whole stages: one file per stage holding the fingerprint of
+# its inputs and the hashes of the outputs it wrote. A stage is skipped when
+# both still match, so hand-edited or deleted outputs are always regenerated.
+class StageFingerprints:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, stage: str) -> Path:
+        return self.root / f"{hashlib.sha256(stage.encode('utf-8')).hexdigest()}.json"
+
+    def lookup(self, stage: str, inputs: str, outputs: list[Path]) -> dict[str, Any] | None:
+        try:
+            record = json.loads(self._path(stage).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            record = None
+        fresh = (
+            isinstance(record, dict)
+            and record.get("stage") == stage
+            and record.get("inputs") == inputs
+            and record.get("outputs") == {str(path): file_digest(path) for path in outputs}
+        )
+        _metrics.add("fingerprint.hits" if fresh else "fingerprint.misses")
+        return record.get("summary", {}) if fresh else None
+
+    def record(self, stage: str, inputs: str, outputs: list[Path], summary: dict[str, Any] | None = None) -> None:
+        record = {
+            "stage": stage,
+            "inputs": inputs,
+            "outputs": {str(path): file_digest(path) for path in outputs},
+            "summary": summary or {},
+        }
+        write_bytes_atomic(self._path(stage), json.dumps(record, indent=1, sort_keys=True).encode("utf-8"))
+
+
+_fingerprints: StageFingerprints | None = None
+
+
+def configure_fingerprints(fingerprint_dir: Path | None) -> StageFingerprints | None:
+    global _fingerprints
+    _fingerprints = StageFingerprints(fingerprint_dir) if fingerprint_dir else None
+    return _fingerprints
+
+
+def lookup_stage(stage: str, inputs: str, outputs: list[Path]) -> dict[str, Any] | None:
+    return _fingerprints.lookup(stage, inputs, outputs) if _fingerprints else None
+
+
+def record_stage(stage: str, inputs: str, outputs: list[Path], summary: dict[str, Any] | None = None) -> None:
+    if _fingerprints:
+        _fingerprints.record(stage, inputs, outputs, summary)
@@ -0,0 +1,171 @@
+"""Pre-rendered publication HTML fragments included by the Jekyll pages."""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .bibtex import iter_bibtex_records
+from .config import FRAGMENT_FORMAT_VERSION
+from .files import file_digest, write_if_changed
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+from .yamldata import load_yaml
+
+FRAGMENT_KINDS = ("card", "entry")
+
+
+def primary_link(links: list[dict[str, Any]]) -> str:
+    # Same choice as _includes/publication_card.html: the arXiv link if
+    # there is one, otherwise the first link.
+    for link in links:
+        if "arxiv" in str(link.get("label", "")).lower() or "arxiv.org" in link["url"].lower():
+            return link["url"]
+    return links[0]["url"] if links else ""
+
+
+def render_card(key: str, citation: dict[str, Any], meta: dict[str, Any]) -> str:
+    # Pre-rendered equivalent of _includes/publication_card.html: BibTeX-derived
+    # title and citation win over the hand-written ones in publication_meta.yml.
+    title = citation.get("title") or meta.get("title") or key
+    citation_text = citation.get("citation") or meta.get("citation") or ""
+    links = [link for link in meta.get("artifact_links") or [] if isinstance(link, dict) and link.get("url")]
+    url = primary_link(links)
+    lines = ['<article class="ri-pub-card">', '  <header class="ri-pub-card-head">']
+    if url:
+        lines.append(
+            f'    <h3><a class="ri-pub-title-link" href="{html.escape(url)}" rel="noopener noreferrer">'
+            f"{html.escape(title)}</a></h3>"
+        )
+    else:
+        lines.append(f"    <h3>{html.escape(title)}</h3>")
+    lines.append("  </header>")
+    if meta.get("award_badge"):
+        lines.append(f'  <p class="ri-pub-badge-row"><span class="ri-badge">{html.escape(meta["award_badge"])}</span></p>')
+    if meta.get("tagline"):
+        lines.append(f'  <p class="ri-pub-tagline">{html.escape(meta["tagline"])}</p>')
+    if citation_text:
+        lines.append(f'  <p class="ri-pub-citation">{html.escape(citation_text)}</p>')
+    if links:
+        anchors = [
+            f'<a href="{html.escape(link["url"])}" rel="noopener noreferrer">{html.escape(str(link.get("label", "")))}</a>'
+            for link in links
+        ]
+        lines.append('  <p class="ri-pub-links">')
+        for index, anchor in enumerate(anchors):
+            if index:
+                lines.append('    <span aria-hidden="true">·</span>')
+            lines.append(f"    {anchor}")
+        lines.append("  </p>")
+    if meta.get("summary"):
+        lines.append(f'  <p class="ri-pub-summary">{html.escape(" ".join(str(meta["summary"]).split()))}</p>')
+    lines.append("</article>")
+    return "\n".join(lines) + "\n"
+
+
+def sentence(text: str) -> str:
+    text = html.escape(text.strip())
+    return text if text.endswith((".", "?", "!")) else f"{text}."
+
+
+def render_entry(citation: dict[str, Any], url: str) -> str:
+    # One line of the full bibliography: "Authors. Title. <i>Venue</i>, Year."
+    # with the short venue name; deliberately not jekyll-scholar's APA style.
+    parts = []
+    if citation.get("authors"):
+        parts.append(sentence(", ".join(citation["authors"])))
+    parts.append(sentence(citation["title"]))
+    venue = str(citation.get("venue", "")).strip()
+    parts.append(f"<i>{html.escape(venue)}</i>, {citation['year']}." if venue else f"{citation['year']}.")
+    text = " ".join(parts)
+    if url:
+        return f'<a class="ri-bib-entry-link" href="{html.escape(url)}" rel="noopener noreferrer">{text}</a>\n'
+    return f'<span class="ri-bib-entry-text">{text}</span>\n'
+
+
+def load_fragment_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return {item["key"]: item for item in payload["publications"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+# State shared by the fragment stages of one task graph.
+@dataclass
+class FragmentRun:
+    manifest: list[dict[str, Any]] = field(default_factory=list)
+    rendered: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    manifest_changed: bool = False
+
+
+def add_fragment_tasks(
+    graph: TaskGraph,
+    citation_data_path: Path,
+    bib_path: Path,
+    meta_path: Path,
+    fragments_dir: Path,
+    manifest_path: Path,
+    after: tuple[str, ...] = (),
+) -> FragmentRun:
+    # One card and one bibliography entry per publication key, written under
+    # fragments_dir and listed, in bibliography order, in manifest_path with
+    # a hash of their inputs: citation data, BibTeX url, publication_meta.yml
+    # entry and FRAGMENT_FORMAT_VERSION (not the code fingerprint, so the
+    # committed manifest does not churn with unrelated code changes). A
+    # fragment is re-rendered only when that hash or the file on disk
+    # differs from the manifest. Manifest paths are relative to the parent
+    # of fragments_dir (_includes/), as Jekyll's {% include %} expects.
+    # Stale fragments are only deleted inside fragments_dir.
+    run = FragmentRun()
+    include_root = fragments_dir.parent
+
+    def render() -> None:
+        with _metrics.phase("fragments.render"):
+            citations: dict[str, dict[str, Any]] = json.loads(citation_data_path.read_text(encoding="utf-8"))
+            urls = {record.key: record.field("url") for record in iter_bibtex_records(bib_path.read_text(encoding="utf-8"))}
+            meta_by_key = load_yaml(meta_path) if meta_path.exists() else {}
+            previous = load_fragment_manifest(manifest_path)
+            for key, citation in citations.items():
+                meta = (meta_by_key or {}).get(key) or {}
+                url = urls.get(key, "")
+                inputs = hashlib.sha256(
+                    json.dumps([FRAGMENT_FORMAT_VERSION, key, citation, url, meta], sort_keys=True).encode("utf-8")
+                ).hexdigest()
+                paths = {kind: fragments_dir / kind / f"{key}.html" for kind in FRAGMENT_KINDS}
+                item = {
+                    "key": key,
+                    "year": citation["year"],
+                    **{kind: path.relative_to(include_root).as_posix() for kind, path in paths.items()},
+                    "inputs": inputs,
+                }
+                old = previous.pop(key, None)
+                if old is None or old.get("inputs") != inputs or any(
+                    old.get("digests", {}).get(kind) != file_digest(path) for kind, path in paths.items()
+                ):
+                    write_if_changed(paths["card"], render_card(key, citation, meta))
+                    write_if_changed(paths["entry"], render_entry(citation, url))
+                    run.rendered.append(key)
+                item["digests"] = {kind: file_digest(path) for kind, path in paths.items()}
+                run.manifest.append(item)
+            for key, old in previous.items():
+                for kind in FRAGMENT_KINDS:
+                    stale = include_root / old[kind] if old.get(kind) else None
+                    if stale is not None and stale.resolve().is_relative_to(fragments_dir.resolve()):
+                        stale.unlink(missing_ok=True)
+                run.removed.append(key)
+        _metrics.add("fragments.rendered", len(run.rendered))
+        _metrics.add("fragments.reused", len(run.manifest) - len(run.rendered))
+
+    def write_manifest() -> None:
+        payload = {"publications": run.manifest}
+        run.manifest_changed = write_if_changed(manifest_path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+    graph.add("fragments.render", render, after)
+    graph.add("fragments.write_manifest", write_manifest, ("fragments.render",))
+    return run
@@ -0,0 +1,352 @@
+"""Resized, re-encoded variants of the site's images for responsive srcsets."""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .config import (
+    DEFAULT_IMAGE_WORKERS,
+    IMAGE_FORMAT_VERSION,
+    IMAGE_FORMATS,
+    IMAGE_QUALITY,
+    IMAGE_WIDTHS,
+    ROOT,
+)
+from .files import file_digest, write_if_changed
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+
+# Source suffix -> format its fallback variants are re-encoded in.
+IMAGE_SOURCE_FORMATS = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png"}
+IMAGE_MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+IMAGE_SUFFIXES = {"avif": "avif", "webp": "webp", "jpeg": "jpg", "png": "png"}
+IMAGEMAGICK_MODE_RE = re.compile(r"^[r-][w-][+-]$")
+JPEG_SOF_MARKERS = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+
+
+def jpeg_size(data: bytes) -> tuple[int, int] | None:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            offset += 2
+            continue
+        if marker in JPEG_SOF_MARKERS and offset + 9 <= len(data):
+            height = int.from_bytes(data[offset + 5 : offset + 7], "big")
+            width = int.from_bytes(data[offset + 7 : offset + 9], "big")
+            return width, height
+        offset += 2 + int.from_bytes(data[offset + 2 : offset + 4], "big")
+    return None
+
+
+def image_size(data: bytes) -> tuple[int, int] | None:
+    # Width and height from the file header, for the formats this stage reads
+    # or writes; None for anything else.
+    if data[:2] == b"\xff\xd8":
+        return jpeg_size(data)
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            return int.from_bytes(data[26:28], "little") & 0x3FFF, int.from_bytes(data[28:30], "little") & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    if data[4:8] == b"ftyp" and b"avif" in data[8:32]:
+        # The primary item's "ispe" property: version/flags, width, height.
+        index = data.find(b"ispe")
+        if index >= 0 and index + 16 <= len(data):
+            width = int.from_bytes(data[index + 8 : index + 12], "big")
+            return width, int.from_bytes(data[index + 12 : index + 16], "big")
+    return None
+
+
+def variant_widths(source_width: int, widths: tuple[int, ...]) -> list[int]:
+    # Every target narrower than the source, plus the source width itself
+    # when it is not wider than the widest target; images are never upscaled.
+    selected = sorted({width for width in widths if width < source_width})
+    if not selected or source_width <= max(widths):
+        selected.append(min(source_width, max(widths)))
+    return sorted(set(selected))
+
+
+# Re-encodes images with an external command-line tool. command() returns
+# the argv that writes one variant; supported_formats() the output formats
+# the installed build can write.
+class ImageEncoder(abc.ABC):
+    name = ""
+
+    @abc.abstractmethod
+    def supported_formats(self) -> set[str]: ...
+
+    @abc.abstractmethod
+    def command(self, source: Path, dest: Path, width: int, image_format: str, quality: int) -> list[str]: ...
+
+
+# ImageMagick 7 (magick) or 6 (convert): auto-orient, strip metadata, shrink
+# (never enlarge) to the target width, then encode (progressive JPEG,
+# compressed PNG).
+class ImageMagickEncoder(ImageEncoder):
+    name = "imagemagick"
+
+    def __init__(self, executable: str) -> None:
+        self.executable = executable
+
+    def supported_formats(self) -> set[str]:
+        # Rows look like "WEBP* WEBP rw+ WebP Image Format" (format, module,
+        # read/write/multi-frame mode, description).
+        result = subprocess.run([self.executable, "-list", "format"], capture_output=True, text=True, check=False)
+        formats = set()
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) >= 3 and IMAGEMAGICK_MODE_RE.match(parts[2]) and parts[2][1] == "w":
+                formats.add(parts[0].rstrip("*+").lower())
+        return formats
+
+    def command(self, source: Path, dest: Path, width: int, image_format: str, quality: int) -> list[str]:
+        options = {
+            "jpeg": ["-sampling-factor", "4:2:0", "-interlace", "Plane", "-quality", str(quality)],
+            "png": ["-define", "png:compression-level=9"],
+            "webp": ["-define", "webp:method=6", "-quality", str(quality)],
+            "avif": ["-quality", str(quality)],
+        }[image_format]
+        return [
+            self.executable,
+            str(source),
+            "-auto-orient",
+            "-strip",
+            "-resize",
+            f"{width}x>",
+            *options,
+            f"{image_format}:{dest}",
+        ]
+
+
+def find_image_encoder() -> ImageEncoder | None:
+    for executable in ("magick", "convert"):
+        path = shutil.which(executable)
+        if path:
+            return ImageMagickEncoder(path)
+    return None
+
+
+# One variant to encode. The encoder writes to `temporary`, which replaces
+# `dest` only once it is a complete, readable image.
+@dataclass(frozen=True)
+class VariantJob:
+    source: str
+    dest: Path
+    temporary: Path
+    width: int
+    image_format: str
+    command: tuple[str, ...]
+
+
+def encode_variant(job: VariantJob) -> dict[str, Any] | str:
+    # Runs in a pool thread; the encoder itself is a separate process, so
+    # DEFAULT_IMAGE_WORKERS threads keep that many encoders busy in parallel.
+    # Returns the variant's manifest record, or an error message.
+    where = f"{job.source} ({job.image_format}, {job.width}w)"
+    try:
+        subprocess.run(job.command, capture_output=True, check=True)
+        data = job.temporary.read_bytes()
+    except (OSError, subprocess.CalledProcessError) as error:
+        job.temporary.unlink(missing_ok=True)
+        stderr = getattr(error, "stderr", b"") or b""
+        return f"{where}: {stderr.decode(errors='replace').strip() or error}"
+    size = image_size(data)
+    if size is None:
+        job.temporary.unlink(missing_ok=True)
+        return f"{where}: encoder output is not a readable image"
+    os.replace(job.temporary, job.dest)
+    return {"width": size[0], "height": size[1], "bytes": len(data)}
+
+
+def load_image_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return dict(payload["images"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def manifest_files(entry: dict[str, Any]) -> list[str]:
+    return [
+        variant["url"]
+        for group in [*entry.get("sources", []), entry.get("fallback", {})]
+        for variant in group.get("variants", [])
+    ]
+
+
+# State shared by the image stages of one task graph.
+@dataclass
+class ImageRun:
+    images: dict[str, dict[str, Any]] = field(default_factory=dict)
+    jobs: list[VariantJob] = field(default_factory=list)
+    pending: dict[str, dict[str, Any]] = field(default_factory=dict)
+    encoded: list[str] = field(default_factory=list)
+    reused: int = 0
+    failed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    encoder: str = ""
+    manifest_changed: bool = False
+
+
+def add_image_tasks(
+    graph: TaskGraph,
+    source_dir: Path,
+    output_dir: Path,
+    manifest_path: Path,
+    site_root: Path = ROOT,
+    widths: tuple[int, ...] = IMAGE_WIDTHS,
+    formats: tuple[str, ...] = IMAGE_FORMATS,
+    encoder: ImageEncoder | None = None,
+    workers: int = DEFAULT_IMAGE_WORKERS,
+    after: tuple[str, ...] = (),
+) -> ImageRun:
+    # plan -> encode -> write_manifest. Every JPEG/PNG under source_dir (but
+    # not output_dir) gets variants at `widths` in each of `formats` plus its
+    # own format as the <img> fallback, written to output_dir as
+    # <stem>-<hash>-<width>.<ext>, where <hash> covers the source bytes and
+    # encoder settings. manifest_path maps each image's site URL to its
+    # srcset groups and records that hash: images whose hash is unchanged
+    # (and whose variants exist) are not re-encoded, and variant files no
+    # longer listed are deleted. Without an encoder, or when encoding an
+    # image fails, the previous entry is kept.
+    run = ImageRun()
+
+    def url_for(path: Path) -> str:
+        return "/" + path.resolve().relative_to(site_root.resolve()).as_posix()
+
+    def plan() -> None:
+        with _metrics.phase("images.plan"):
+            previous = load_image_manifest(manifest_path)
+            image_encoder = encoder or find_image_encoder()
+            supported = image_encoder.supported_formats() if image_encoder else set()
+            run.encoder = image_encoder.name if image_encoder else ""
+            output = output_dir.resolve()
+            sources = sorted(
+                path
+                for path in source_dir.rglob("*")
+                if path.suffix.lower() in IMAGE_SOURCE_FORMATS and output not in path.resolve().parents
+            )
+            for path in sources:
+                url = url_for(path)
+                fallback_format = IMAGE_SOURCE_FORMATS[path.suffix.lower()]
+                image_formats = [name for name in formats if name != fallback_format] + [fallback_format]
+                settings = [
+                    IMAGE_FORMAT_VERSION,
+                    file_digest(path),
+                    sorted(widths),
+                    image_formats,
+                    {name: IMAGE_QUALITY.get(name) for name in image_formats},
+                ]
+                source_hash = hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
+                # The previous entry is only worth keeping while its files exist.
+                old = previous.get(url)
+                if old is not None and not all((site_root / name.lstrip("/")).exists() for name in manifest_files(old)):
+                    old = None
+                if old is not None and old.get("source_hash") == source_hash:
+                    run.images[url] = old
+                    run.reused += 1
+                    continue
+                size = image_size(path.read_bytes())
+                if image_encoder is None or size is None:
+                    if old is not None:
+                        run.images[url] = old
+                    if size is None:
+                        run.failed.append(f"{url}: unreadable image header")
+                    continue
+                unsupported = [name for name in image_formats if name not in supported]
+                if unsupported:
+                    run.failed.append(f"{url}: {image_encoder.name} cannot write {', '.join(unsupported)}")
+                    image_formats = [name for name in image_formats if name in supported]
+                    if fallback_format not in image_formats:
+                        if old is not None:
+                            run.images[url] = old
+                        continue
+                entry: dict[str, Any] = {"source_hash": source_hash, "jobs": []}
+                for image_format in image_formats:
+                    quality = IMAGE_QUALITY.get(image_format, 80)
+                    for width in variant_widths(size[0], widths):
+                        dest = output_dir / f"{path.stem}-{source_hash[:10]}-{width}.{IMAGE_SUFFIXES[image_format]}"
+                        temporary = dest.with_name(f".{dest.name}.tmp")
+                        command = image_encoder.command(path, temporary, width, image_format, quality)
+                        job = VariantJob(url, dest, temporary, width, image_format, tuple(command))
+                        entry["jobs"].append(job)
+                        run.jobs.append(job)
+                entry["fallback_format"] = fallback_format
+                entry["previous"] = old
+                run.pending[url] = entry
+
+    def encode() -> None:
+        if not run.jobs:
+            return
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with _metrics.phase("images.encode"):
+            with ThreadPoolExecutor(max_workers=max(min(workers, len(run.jobs)), 1)) as pool:
+                results = dict(zip(run.jobs, pool.map(encode_variant, run.jobs)))
+        _metrics.add("images.variants", len(run.jobs))
+        for url, entry in run.pending.items():
+            errors = [results[job] for job in entry["jobs"] if isinstance(results[job], str)]
+            if errors:
+                run.failed.extend(errors)
+                if entry["previous"] is not None:
+                    run.images[url] = entry["previous"]
+                continue
+            groups: dict[str, list[dict[str, Any]]] = {}
+            for job in entry["jobs"]:
+                groups.setdefault(job.image_format, []).append({"url": url_for(job.dest), **results[job]})
+            fallback = groups.pop(entry["fallback_format"])
+            run.images[url] = {
+                "source_hash": entry["source_hash"],
+                "sources": [
+                    {"type": IMAGE_MIME_TYPES[name], "variants": variants} for name, variants in groups.items()
+                ],
+                "fallback": {
+                    "type": IMAGE_MIME_TYPES[entry["fallback_format"]],
+                    "url": fallback[-1]["url"],
+                    "width": fallback[-1]["width"],
+                    "height": fallback[-1]["height"],
+                    "variants": fallback,
+                },
+            }
+            run.encoded.append(url)
+        _metrics.add("images.encoded", len(run.encoded))
+
+    def write_manifest() -> None:
+        images = dict(sorted(run.images.items()))
+        keep = {name for entry in images.values() for name in manifest_files(entry)}
+        if output_dir.is_dir():
+            for path in sorted(output_dir.iterdir()):
+                if path.is_file() and url_for(path) not in keep:
+                    path.unlink()
+                    run.removed.append(path.name)
+        for message in run.failed:
+            print(f"[images] {message}", file=sys.stderr)
+        payload = {"images": images}
+        run.manifest_changed = write_if_changed(manifest_path, json.dumps(payload, indent=2) + "\n")
+
+    graph.add("images.plan", plan, after)
+    graph.add("images.encode", encode, ("images.plan",))
+    graph.add("images.write_manifest", write_manifest, ("images.encode",))
+    return run
@@ -0,0 +1,145 @@
+"""LaTeX to plain-text conversion."""
+
+from __future__ import annotations
+
+import functools
+import re
+import unicodedata
+from typing import Any
+
+ACCENT_TO_COMBINING: dict[str, str] = {
+    "'": "\u0301",
+    "`": "\u0300",
+    "^": "\u0302",
+    '"': "\u0308",
+    "~": "\u0303",
+    "c": "\u0327",
+}
+
+LATEX_ACCENT_RES: tuple[re.Pattern[str], ...] = (
+    re.compile(r"\{\\(?P<accent>['\"`^~c])\{(?P<letter>[A-Za-z])\}\}"),
+    re.compile(r"\\(?P<accent>['\"`^~c])\{(?P<letter>[A-Za-z])\}"),
+    re.compile(r"\\(?P<accent>['\"`^~c])(?P<letter>[A-Za-z])"),
+)
+
+# Commands whose single argument is kept verbatim by latex_to_plain.
+LATEX_FORMATTING_COMMANDS: tuple[str, ...] = (
+    "textbf",
+    "textit",
+    "textsb",
+    "texttt",
+    "emph",
+    "textnormal",
+    "textrm",
+    "textsc",
+    "underline",
+)
+
+LATEX_GROUP_TOKEN_RE = re.compile(rf"\\(href|{'|'.join(LATEX_FORMATTING_COMMANDS)})\s*\{{|[{{}}]")
+LATEX_HREF_TEXT_RE = re.compile(r"\s*\{")
+LATEX_NEWLINE_RE = re.compile(r"\\newline\*?")
+LATEX_COMMAND_RE = re.compile(r"\\[A-Za-z]+\*?(?:\[[^\]]*\])?")
+BIBTEX_COMMAND_RE = re.compile(r"\\[A-Za-z]+")
+
+LATEX_PLAIN_REPLACEMENTS: tuple[tuple[str, str], ...] = (
+    ("\\%", "%"),
+    ("\\&", "&"),
+    ("\\_", "_"),
+    ("\\#", "#"),
+    ("\\$", "$"),
+    ("\\,", " "),
+    ("~", " "),
+    ("``", '"'),
+    ("''", '"'),
+)
+
+PLAIN_TEXT_CACHE_SIZE = 8192
+
+
+def replace_accent(match: re.Match[str]) -> str:
+    accent = match.group("accent")
+    letter = match.group("letter")
+    combining = ACCENT_TO_COMBINING.get(accent)
+    if not combining:
+        return letter
+    return unicodedata.normalize("NFC", letter + combining)
+
+
+def decode_latex_accents(text: str) -> str:
+    out = text.replace("\\i", "i").replace("\\j", "j")
+    for pattern in LATEX_ACCENT_RES:
+        out = pattern.sub(replace_accent, out)
+    return out
+
+
+def unwrap_formatting_commands(text: str) -> str:
+    # Single left-to-right scan with an explicit group stack. A formatting
+    # command (or \href's text) is unwrapped when its argument contains no
+    # braces once its own nested commands are unwrapped, which is what
+    # repeatedly applying the innermost-group regexes converges to. Output
+    # pieces go to one shared list; unwrapping only records the span of its
+    # opener in `dropped` (a difference array), and the result is joined once
+    # at the end, so the cost stays linear whatever the nesting depth.
+    # Frame: [kind, opener_start, opener_end, has_braces]
+    out: list[str] = []
+    dropped: dict[int, int] = {}
+    stack: list[list[Any]] = [["root", 0, 0, False]]
+    pos = 0
+    while True:
+        match = LATEX_GROUP_TOKEN_RE.search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            break
+        out.append(text[pos : match.start()])
+        pos = match.end()
+        token = match.group()
+        name = match.group(1)
+        if name or token == "{":
+            kind = "href_url" if name == "href" else "command" if name else "group"
+            stack.append([kind, len(out), len(out) + 1, False])
+            out.append(token)
+            continue
+        if len(stack) == 1:
+            out.append(token)
+            stack[0][3] = True
+            continue
+
+        kind, opener_start, opener_end, has_braces = stack.pop()
+        parent = stack[-1]
+        if kind == "href_url" and not has_braces:
+            text_open = LATEX_HREF_TEXT_RE.match(text, pos)
+            if text_open:
+                # The URL argument joins the opener of \href's text argument.
+                out.append(f"}}{text_open.group()}")
+                stack.append(["href_text", opener_start, len(out), False])
+                pos = text_open.end()
+                continue
+        if kind in {"command", "href_text"} and not has_braces:
+            dropped[opener_start] = dropped.get(opener_start, 0) + 1
+            dropped[opener_end] = dropped.get(opener_end, 0) - 1
+        else:
+            out.append("}")
+            parent[3] = True
+
+    # Unclosed groups are kept as written.
+    depth = 0
+    pieces: list[str] = []
+    for index, piece in enumerate(out):
+        depth += dropped.get(index, 0)
+        if not depth:
+            pieces.append(piece)
+    return "".join(pieces)
+
+
+@functools.lru_cache(maxsize=PLAIN_TEXT_CACHE_SIZE)
+def latex_to_plain(text: str) -> str:
+    out = decode_latex_accents(text)
+    out = unwrap_formatting_commands(out)
+    for src, dst in LATEX_PLAIN_REPLACEMENTS:
+        out = out.replace(src, dst)
+
+    out = LATEX_NEWLINE_RE.sub(" ", out)
+    out = LATEX_COMMAND_RE.sub("", out)
+    out = out.replace("{", "").replace("}", "")
+    out = " ".join(out.split())
+    return out.strip()
@@ -0,0 +1,71 @@
+"""Run statistics collected across stages and emitted with --metrics."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+
+# Thread-safe run statistics: named counters, accumulated phase timings and
+# one record per write_if_changed call. Emitted with --metrics.
+class SyncMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.perf_counter()
+            self.counters: dict[str, float] = {}
+            self.phases: dict[str, dict[str, float]] = {}
+            self.writes: list[dict[str, Any]] = []
+
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                phase = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0})
+                phase["calls"] += 1
+                phase["seconds"] += elapsed
+
+    def record_write(self, path: Path, size: int, changed: bool, seconds: float) -> None:
+        with self._lock:
+            self.writes.append({"path": str(path), "bytes": size, "changed": changed, "seconds": round(seconds, 6)})
+
+    def report(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "wall_seconds": round(time.perf_counter() - self.started, 6),
+                "counters": {name: round(value, 6) for name, value in sorted(self.counters.items())},
+                "phases": {
+                    name: {"calls": int(phase["calls"]), "seconds": round(phase["seconds"], 6)}
+                    for name, phase in sorted(self.phases.items())
+                },
+                "writes": list(self.writes),
+            }
+
+
+_metrics = SyncMetrics()
+
+
+def reset_metrics() -> SyncMetrics:
+    # Reset in place: stage modules hold a reference to this instance.
+    _metrics.reset()
+    return _metrics
+
+
+def backoff_sleep(seconds: float) -> None:
+    _metrics.add("fetch.retries")
+    _metrics.add("fetch.backoff_seconds", seconds)
+    time.sleep(seconds)
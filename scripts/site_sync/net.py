@@ -0,0 +1,550 @@
+"""HTTP client, conditional-request cache and retrying fetches."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import DEFAULT_DBLP_BASE_URL, HTTP_MAX_IDLE_PER_HOST, HTTP_MAX_REDIRECTS, HTTP_TIMEOUT_SECONDS
+from .files import write_bytes_atomic
+from .metrics import _metrics, backoff_sleep
+from .ratelimit import THROTTLE_STATUSES, HostRateLimiter
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    etag: str
+    last_modified: str
+    body_hash: str
+    validated_at: float
+    body: bytes
+
+
+# On-disk response cache keyed by URL, with bodies stored by content hash:
+# - entries/<sha256(url)>.json: validators and the body hash for one URL
+# - blobs/<sha256(body)>: raw response bodies, shared between URLs
+class HttpCache:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.entries_dir = root / "entries"
+        self.blobs_dir = root / "blobs"
+
+    def _entry_path(self, url: str) -> Path:
+        return self.entries_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, url: str) -> CachedResponse | None:
+        try:
+            meta = json.loads(self._entry_path(url).read_text(encoding="utf-8"))
+            body = (self.blobs_dir / meta["body"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+        if meta.get("url") != url or hashlib.sha256(body).hexdigest() != meta["body"]:
+            return None
+        return CachedResponse(
+            url=url,
+            etag=str(meta.get("etag", "")),
+            last_modified=str(meta.get("last_modified", "")),
+            body_hash=meta["body"],
+            validated_at=float(meta.get("validated_at", 0.0)),
+            body=body,
+        )
+
+    def store(self, url: str, body: bytes, etag: str, last_modified: str) -> None:
+        body_hash = hashlib.sha256(body).hexdigest()
+        blob_path = self.blobs_dir / body_hash
+        if not blob_path.exists():
+            write_bytes_atomic(blob_path, body)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body_hash,
+            "validated_at": time.time(),
+        }
+        write_bytes_atomic(self._entry_path(url), json.dumps(meta, sort_keys=True).encode("utf-8"))
+
+    def prune(self, max_age_seconds: float, max_bytes: int) -> int:
+        # Drop entries not revalidated within max_age_seconds, then the least
+        # recently validated ones until referenced blobs fit in max_bytes.
+        if not self.entries_dir.is_dir():
+            return 0
+        now = time.time()
+        entries: list[tuple[float, Path, str]] = []
+        removed = 0
+        for entry_path in self.entries_dir.glob("*.json"):
+            try:
+                meta = json.loads(entry_path.read_text(encoding="utf-8"))
+                validated_at = float(meta["validated_at"])
+                body_hash = str(meta["body"])
+            except (OSError, ValueError, KeyError):
+                entry_path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            if now - validated_at > max_age_seconds:
+                entry_path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((validated_at, entry_path, body_hash))
+
+        entries.sort(key=lambda item: item[0], reverse=True)
+        blob_sizes: dict[str, int] = {}
+        total = 0
+        for validated_at, entry_path, body_hash in entries:
+            if body_hash not in blob_sizes:
+                try:
+                    size = (self.blobs_dir / body_hash).stat().st_size
+                except OSError:
+                    size = 0
+                if total + size > max_bytes:
+                    entry_path.unlink(missing_ok=True)
+                    removed += 1
+                    continue
+                blob_sizes[body_hash] = size
+                total += size
+
+        if self.blobs_dir.is_dir():
+            for blob_path in self.blobs_dir.iterdir():
+                if blob_path.name not in blob_sizes:
+                    blob_path.unlink(missing_ok=True)
+        return removed
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    url: str
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+def decode_content(body: bytes, encoding: str) -> bytes:
+    encoding = encoding.strip().lower()
+    if encoding in {"", "identity"}:
+        return body
+    if encoding in {"gzip", "x-gzip"}:
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        # Servers disagree on whether "deflate" carries a zlib header.
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+# Keep-alive HTTP client that reuses one connection per in-flight request to
+# each host instead of paying a TCP+TLS handshake for every fetch. Errors are
+# reported as urllib.error.HTTPError/URLError so callers keep urllib semantics.
+# With a limiter, every request (including retries and redirects) waits for
+# admission to its host and reports back whether it was throttled.
+class HttpClient:
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        max_idle_per_host: int = HTTP_MAX_IDLE_PER_HOST,
+        limiter: HostRateLimiter | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.limiter = limiter
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _acquire(self, origin: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = origin
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, origin: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _request_once(self, method: str, url: str, headers: dict[str, str], body: bytes | None) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        origin = (parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry such failures once on a fresh connection. Only idempotent
+        # requests are resent: a POST may already have reached the server, so
+        # its failure goes to the caller's retry policy instead.
+        while True:
+            if self.limiter:
+                self.limiter.acquire(parts.netloc)
+            connection, reused = self._acquire(origin)
+            if not reused:
+                _metrics.add("http.connections_opened")
+            _metrics.add("http.requests")
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                _metrics.add("http.transport_errors")
+                if self.limiter:
+                    self.limiter.release(parts.netloc, None)
+                if reused and method in IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(error) from error
+            break
+        if self.limiter:
+            self.limiter.release(parts.netloc, response.status, response.headers.get("Retry-After", ""))
+        _metrics.add("http.wire_bytes", len(raw))
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(origin, connection)
+        encoding = response.headers.get("Content-Encoding", "")
+        # A truncated or corrupt compressed body is a transport failure, so
+        # fetch_text() retries it and falls back to the cache like one.
+        try:
+            body = decode_content(raw, encoding)
+        except (OSError, EOFError, zlib.error) as error:
+            _metrics.add("http.decode_errors")
+            raise urllib.error.URLError(f"Corrupt {encoding} response body from {url}: {error}") from error
+        return HttpResponse(url=url, status=response.status, headers=response.headers, body=body)
+
+    def request(self, method: str, url: str, headers: dict[str, str], body: bytes | None = None) -> HttpResponse:
+        # Redirects keep the method and body only for 307/308, like browsers.
+        request_headers = {"Accept-Encoding": "gzip, deflate", **headers}
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            response = self._request_once(method, url, request_headers, body)
+            location = response.headers.get("Location", "")
+            if response.status in {301, 302, 303, 307, 308} and location:
+                url = urllib.parse.urljoin(url, location)
+                if response.status not in {307, 308}:
+                    method, body = "GET", None
+                continue
+            if response.status >= 300:
+                raise urllib.error.HTTPError(
+                    url, response.status, http.client.responses.get(response.status, ""), response.headers, None
+                )
+            return response
+        raise urllib.error.URLError(f"Too many redirects for URL: {url}")
+
+    def get(self, url: str, headers: dict[str, str]) -> HttpResponse:
+        return self.request("GET", url, headers)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [connection for connections in self._idle.values() for connection in connections]
+            self._idle.clear()
+        for connection in idle:
+            connection.close()
+
+
+FIXTURE_REQUEST_HEADERS = ("If-None-Match", "If-Modified-Since")
+FIXTURE_RESPONSE_HEADERS = ("ETag", "Last-Modified", "Retry-After", "Content-Type")
+
+
+def fixture_request_key(url: str, headers: dict[str, str], method: str = "GET", body: bytes | None = None) -> str:
+    # Conditional headers are part of the key so a replay answers a
+    # revalidation exactly as the server did (304 or a fresh body); other
+    # methods are also keyed by a hash of the request body.
+    parts = [url, *(headers.get(name, "") for name in FIXTURE_REQUEST_HEADERS)]
+    if method != "GET":
+        parts = [method, *parts, hashlib.sha256(body or b"").hexdigest()]
+    return "\n".join(parts)
+
+
+def build_headers(pairs: dict[str, str]) -> http.client.HTTPMessage:
+    headers = http.client.HTTPMessage()
+    for name, value in pairs.items():
+        headers[name] = value
+    return headers
+
+
+# Recorded request/response pairs for --record/--replay:
+# - interactions-<pid>.jsonl: one exchange per line (request key, status,
+#   selected response headers, body hash); one file per recording process
+# - bodies/<sha256(body)>.gz: gzip-compressed bodies, shared between exchanges
+class HttpFixtureArchive:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.bodies_dir = root / "bodies"
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        for path in self.root.glob("interactions-*.jsonl"):
+            path.unlink()
+
+    def append(
+        self,
+        key: str,
+        method: str,
+        url: str,
+        status: int,
+        response_headers: http.client.HTTPMessage,
+        body: bytes,
+    ) -> None:
+        body_hash = hashlib.sha256(body).hexdigest()
+        blob_path = self.bodies_dir / f"{body_hash}.gz"
+        if body and not blob_path.exists():
+            write_bytes_atomic(blob_path, gzip.compress(body, mtime=0))
+        line = {
+            "key": key,
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": {name: response_headers[name] for name in FIXTURE_RESPONSE_HEADERS if response_headers.get(name)},
+            "body": body_hash if body else "",
+        }
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with (self.root / f"interactions-{os.getpid()}.jsonl").open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(line, sort_keys=True) + "\n")
+
+    def load(self) -> list[dict[str, Any]]:
+        interactions: list[dict[str, Any]] = []
+        for path in sorted(self.root.glob("interactions-*.jsonl")):
+            with path.open(encoding="utf-8") as handle:
+                interactions.extend(json.loads(line) for line in handle if line.strip())
+        return interactions
+
+    def body(self, body_hash: str) -> bytes:
+        if not body_hash:
+            return b""
+        return gzip.decompress((self.bodies_dir / f"{body_hash}.gz").read_bytes())
+
+
+# HttpClient that appends every completed exchange, including error statuses
+# such as 304 or 503, to a fixture archive. Transport errors are not recorded.
+class RecordingHttpClient(HttpClient):
+    def __init__(self, archive: HttpFixtureArchive, limiter: HostRateLimiter | None = None) -> None:
+        super().__init__(limiter=limiter)
+        self.archive = archive
+
+    def request(self, method: str, url: str, headers: dict[str, str], body: bytes | None = None) -> HttpResponse:
+        key = fixture_request_key(url, headers, method, body)
+        try:
+            response = super().request(method, url, headers, body)
+        except urllib.error.HTTPError as error:
+            self.archive.append(key, method, url, error.code, error.headers, b"")
+            raise
+        self.archive.append(key, method, url, response.status, response.headers, response.body)
+        return response
+
+
+# Serves recorded exchanges without touching the network. Repeated requests
+# for one key are answered in recorded order (the last answer repeats); a
+# revalidation that was never recorded falls back to the URL's last full
+# response (GET only). Unknown requests fail like a non-retryable 404.
+class ReplayHttpClient:
+    limiter = None
+
+    def __init__(self, archive: HttpFixtureArchive) -> None:
+        self.archive = archive
+        self._by_key: dict[str, list[dict[str, Any]]] = {}
+        self._full_by_url: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        for interaction in archive.load():
+            self._by_key.setdefault(interaction["key"], []).append(interaction)
+            if interaction["status"] < 300 and interaction.get("method", "GET") == "GET":
+                self._full_by_url[interaction["url"]] = interaction
+
+    def request(self, method: str, url: str, headers: dict[str, str], body: bytes | None = None) -> HttpResponse:
+        with self._lock:
+            queue = self._by_key.get(fixture_request_key(url, headers, method, body))
+            if queue:
+                interaction = queue.pop(0) if len(queue) > 1 else queue[0]
+            else:
+                interaction = self._full_by_url.get(url) if method == "GET" else None
+        _metrics.add("http.replayed")
+        if interaction is None:
+            reason = f"no recorded response in {self.archive.root}"
+            raise urllib.error.HTTPError(url, 404, reason, build_headers({}), None)
+        response_headers = build_headers(interaction["headers"])
+        status = int(interaction["status"])
+        if status >= 300:
+            raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+        body = self.archive.body(interaction["body"])
+        return HttpResponse(url=url, status=status, headers=response_headers, body=body)
+
+    def get(self, url: str, headers: dict[str, str]) -> HttpResponse:
+        return self.request("GET", url, headers)
+
+    def close(self) -> None:
+        return
+
+
+# One limiter per process, kept across client reconfiguration, so every
+# fetch to a host shares what was learned about its throttling.
+_rate_limiter = HostRateLimiter()
+_http_client: HttpClient | ReplayHttpClient = HttpClient(limiter=_rate_limiter)
+_http_cache: HttpCache | None = None
+
+_dblp_base_url = DEFAULT_DBLP_BASE_URL
+
+
+def configure_dblp_base_url(base_url: str) -> None:
+    global _dblp_base_url
+    _dblp_base_url = base_url.rstrip("/")
+
+
+def dblp_url(path: str) -> str:
+    return f"{_dblp_base_url}/{path}"
+
+
+def close_http_client() -> None:
+    _http_client.close()
+
+
+def configure_http_fixtures(record_dir: Path | None, replay_dir: Path | None, clear: bool = True) -> None:
+    # Batch workers pass clear=False so they add to the parent's recording.
+    global _http_client
+    if not (record_dir or replay_dir) and type(_http_client) is HttpClient:
+        return
+    _http_client.close()
+    if replay_dir:
+        _http_client = ReplayHttpClient(HttpFixtureArchive(replay_dir))
+    elif record_dir:
+        archive = HttpFixtureArchive(record_dir)
+        if clear:
+            archive.clear()
+        _http_client = RecordingHttpClient(archive, _rate_limiter)
+    else:
+        _http_client = HttpClient(limiter=_rate_limiter)
+
+
+def configure_http_cache(cache_dir: Path | None) -> HttpCache | None:
+    global _http_cache
+    _http_cache = HttpCache(cache_dir) if cache_dir else None
+    return _http_cache
+
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def rate_limiter_snapshot() -> dict[str, dict[str, float]]:
+    return _rate_limiter.snapshot()
+
+
+def wait_before_retry(error: urllib.error.HTTPError, attempt: int) -> None:
+    # A throttled response has already paused its host in the shared limiter,
+    # which holds back this retry along with every other request to the host.
+    if error.code in THROTTLE_STATUSES and _http_client.limiter is not None:
+        _metrics.add("fetch.retries")
+        return
+    retry_after_raw = error.headers.get("Retry-After", "").strip()
+    if retry_after_raw.isdigit():
+        backoff_sleep(max(int(retry_after_raw), 1))
+    else:
+        backoff_sleep(min(2 ** attempt, 10))
+
+
+def fetch_text(url: str, retries: int = 5) -> str:
+    cache = _http_cache
+    cached = cache.load(url) if cache else None
+    headers = {
+        "User-Agent": "alexiacob-site-sync/1.0",
+        "Accept": "text/plain,application/xml;q=0.9,*/*;q=0.8",
+    }
+    if cached:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    _metrics.add("fetch.calls")
+    for attempt in range(retries):
+        try:
+            response = _http_client.get(url, headers)
+            data = response.body
+            _metrics.add("fetch.body_bytes", len(data))
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+            if cache:
+                cache.store(url, data, etag, last_modified)
+            return data.decode("utf-8")
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and cache and cached:
+                _metrics.add("fetch.not_modified")
+                cache.store(
+                    url,
+                    cached.body,
+                    error.headers.get("ETag", "") or cached.etag,
+                    error.headers.get("Last-Modified", "") or cached.last_modified,
+                )
+                return cached.body.decode("utf-8")
+            retryable = error.code in RETRYABLE_STATUSES
+            if retryable and attempt == retries - 1 and cached:
+                return stale_fallback(cached, error)
+            if not retryable or attempt == retries - 1:
+                raise
+            wait_before_retry(error, attempt)
+        except urllib.error.URLError as error:
+            if attempt == retries - 1:
+                if cached:
+                    return stale_fallback(cached, error)
+                raise
+            backoff_sleep(min(2 ** attempt, 10))
+    raise RuntimeError(f"Unreachable fetch failure for URL: {url}")
+
+
+def stale_fallback(cached: CachedResponse, error: Exception) -> str:
+    _metrics.add("fetch.stale_fallbacks")
+    age_hours = max(time.time() - cached.validated_at, 0) / 3600
+    print(
+        f"[http] serving cached copy of {cached.url} ({age_hours:.1f}h old) after fetch failure: {error}",
+        file=sys.stderr,
+    )
+    return cached.body.decode("utf-8")
+
+
+def post_json(url: str, payload: Any, headers: dict[str, str] | None = None, retries: int = 5) -> Any:
+    # Uncached: POST lookups are cached by their callers, per requested item.
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    request_headers = {
+        "User-Agent": "alexiacob-site-sync/1.0",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        **(headers or {}),
+    }
+    _metrics.add("fetch.calls")
+    for attempt in range(retries):
+        try:
+            response = _http_client.request("POST", url, request_headers, body)
+            _metrics.add("fetch.body_bytes", len(response.body))
+            return json.loads(response.body.decode("utf-8"))
+        except urllib.error.HTTPError as error:
+            if error.code not in RETRYABLE_STATUSES or attempt == retries - 1:
+                raise
+            wait_before_retry(error, attempt)
+        except urllib.error.URLError:
+            if attempt == retries - 1:
+                raise
+            backoff_sleep(min(2 ** attempt, 10))
+    raise RuntimeError(f"Unreachable fetch failure for URL: {url}")
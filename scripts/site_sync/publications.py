@@ -0,0 +1,438 @@
+"""Publication sync: DBLP selection to papers.bib and citation data."""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import sys
+import urllib.error
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from .bibtex import (
+    BibtexRecord,
+    bibtex_field_changes,
+    bibtex_value_to_plain,
+    build_citation,
+    fetch_bibtex_index,
+    fetch_bibtex_records,
+    parse_bibtex_authors,
+    parse_bibtex_entry,
+)
+from .config import DEFAULT_MAX_CONCURRENCY, SYNC_STATE_VERSION
+from .dblp import (
+    DblpCandidate,
+    choose_publication_key,
+    fetch_dblp_profile,
+    iter_dblp_candidates,
+    iter_text_chunks,
+    select_highest_level_publications,
+)
+from .files import write_chunks_if_changed
+from .fingerprints import input_fingerprint, lookup_stage, record_stage
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+from .overrides import BIBTEX_OVERRIDES_BY_KEY, MANUAL_PUBLICATIONS
+
+
+# Website keys added, updated and removed by a sync; `fields` names the
+# changed BibTeX fields (and entry attributes) of each updated key whose
+# previous entry is in the sync state.
+@dataclass(frozen=True)
+class PublicationChangeset:
+    added: list[str]
+    updated: list[str]
+    removed: list[str]
+    fields: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"added": self.added, "updated": self.updated, "removed": self.removed, "fields": self.fields}
+
+
+def entry_hash(entry: dict[str, Any]) -> str:
+    payload = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_sync_state(path: Path | None) -> dict[str, Any]:
+    empty: dict[str, Any] = {"version": SYNC_STATE_VERSION, "records": {}, "outputs": {}}
+    if path is None or not path.exists():
+        return empty
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return empty
+    if not isinstance(state, dict) or state.get("version") != SYNC_STATE_VERSION:
+        return empty
+    state.setdefault("records", {})
+    state.setdefault("outputs", {})
+    return state
+
+
+def reusable_entry(state: dict[str, Any], candidate: DblpCandidate, publication_key: str) -> dict[str, Any] | None:
+    # A record is reused only when DBLP reports the same modification date and
+    # the stored entry still matches its recorded hash and website key.
+    record = state["records"].get(candidate.dblp_key)
+    if not record or not candidate.mdate or record.get("mdate") != candidate.mdate:
+        return None
+    entry = record.get("entry")
+    if not isinstance(entry, dict) or entry.get("key") != publication_key:
+        return None
+    if entry_hash(entry) != record.get("hash"):
+        return None
+    return entry
+
+
+def entry_changes(previous: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    # Semantic difference of two entries for the same website key: changed
+    # BibTeX fields, then the entry attributes not taken from the BibTeX.
+    changes = bibtex_field_changes(parse_bibtex_entry(previous["bibtex"]), parse_bibtex_entry(current["bibtex"]))
+    changes.extend(name for name in ("dblp_key", "venue", "level") if previous.get(name) != current.get(name))
+    return changes
+
+
+def diff_outputs(
+    previous: dict[str, str],
+    current: dict[str, str],
+    previous_entries: dict[str, dict[str, Any]] | None = None,
+    entries: dict[str, dict[str, Any]] | None = None,
+) -> PublicationChangeset:
+    updated = sorted(key for key in current if key in previous and previous[key] != current[key])
+    fields = {
+        key: entry_changes(previous_entries[key], entries[key])
+        for key in updated
+        if previous_entries and entries and key in previous_entries and key in entries
+    }
+    return PublicationChangeset(
+        added=sorted(key for key in current if key not in previous),
+        updated=updated,
+        removed=sorted(key for key in previous if key not in current),
+        fields=fields,
+    )
+
+
+def resolve_bibtex_records(
+    dblp_pid: str,
+    dblp_keys: list[str],
+    max_concurrency: int,
+    bulk_bibtex: bool,
+) -> dict[str, BibtexRecord]:
+    fetched: dict[str, BibtexRecord] = {}
+    if bulk_bibtex and dblp_keys:
+        try:
+            bulk_index = fetch_bibtex_index(dblp_pid)
+        except (urllib.error.URLError, ValueError) as error:
+            print(f"[pubs] bulk BibTeX file unusable, fetching per record: {error}", file=sys.stderr)
+            bulk_index = {}
+        fetched = {key: bulk_index[key] for key in dblp_keys if key in bulk_index}
+    missing_keys = [key for key in dblp_keys if key not in fetched]
+    fetched.update(zip(missing_keys, fetch_bibtex_records(missing_keys, max_concurrency)))
+    return fetched
+
+
+def build_publication_entry(
+    publication_key: str,
+    source_key: str,
+    record: BibtexRecord,
+    venue: str,
+    year: int,
+    level: str,
+    fallback_title: str = "",
+) -> dict[str, Any]:
+    # Everything below reads from the parsed record; the stored "bibtex" text
+    # is its canonical serialization under the website key, so DBLP layout
+    # changes (wrapping, field order, quoting) never reach papers.bib.
+    authors = parse_bibtex_authors(record)
+    title = bibtex_value_to_plain(record.field("title") or fallback_title)
+    citation = build_citation(authors, venue, year)
+    return {
+        "key": publication_key,
+        "dblp_key": source_key,
+        "title": title,
+        "year": year,
+        "venue": venue,
+        "level": level,
+        "authors": authors,
+        "citation": citation,
+        "bibtex": record.with_key(publication_key).canonical().render(),
+    }
+
+
+def iter_bibliography(entries: list[dict[str, Any]]) -> Iterator[str]:
+    yield "% Auto-generated from DBLP by scripts/sync_cv_and_publications.py.\n"
+    yield "% Selection policy: conference > workshop > arXiv (for duplicate works).\n"
+    for entry in entries:
+        yield f"\n{entry['bibtex'].strip()}\n"
+
+
+def citation_record(entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "title": entry["title"],
+        "citation": entry["citation"],
+        "venue": entry["venue"],
+        "year": entry["year"],
+        "authors": entry["authors"],
+        "dblp_key": entry["dblp_key"],
+        "level": entry["level"],
+    }
+
+
+def iter_citation_data(entries: list[dict[str, Any]]) -> Iterator[str]:
+    # Same bytes as json.dumps(payload, indent=2) of the whole mapping, one
+    # entry at a time. Encoded JSON never contains a raw newline, so nested
+    # objects are re-indented by rewriting line breaks.
+    separator = "{\n  "
+    for entry in entries:
+        value = json.dumps(citation_record(entry), indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        yield f"{separator}{json.dumps(entry['key'], ensure_ascii=False)}: {value}"
+        separator = ",\n  "
+    yield "{}\n" if separator == "{\n  " else "\n}\n"
+
+
+def plan_publication_records(
+    selected: list[DblpCandidate],
+    state: dict[str, Any],
+) -> tuple[list[str], dict[str, dict[str, Any]], list[str]]:
+    # Assign website keys, then split DBLP records into those reusable from
+    # the sync state and those whose BibTeX must be fetched.
+    used_keys: set[str] = set()
+    publication_keys = [
+        choose_publication_key(candidate.title, candidate.year, used_keys) for candidate in selected
+    ]
+    reused: dict[str, dict[str, Any]] = {}
+    fetch_keys: list[str] = []
+    for candidate, publication_key in zip(selected, publication_keys):
+        if publication_key in BIBTEX_OVERRIDES_BY_KEY:
+            continue
+        entry = reusable_entry(state, candidate, publication_key)
+        if entry is not None:
+            reused[candidate.dblp_key] = entry
+        else:
+            fetch_keys.append(candidate.dblp_key)
+    return publication_keys, reused, fetch_keys
+
+
+# State shared by the publication stages of one task graph.
+@dataclass
+class PublicationRun:
+    selected: list[DblpCandidate] | None
+    profile_digest: str | None
+    profile_xml: str | None = None
+    fingerprint: str | None = None
+    skipped: bool = False
+    state: dict[str, Any] = field(default_factory=dict)
+    publication_keys: list[str] = field(default_factory=list)
+    reused: dict[str, dict[str, Any]] = field(default_factory=dict)
+    fetch_keys: list[str] = field(default_factory=list)
+    fetched: dict[str, BibtexRecord] = field(default_factory=dict)
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    records: dict[str, dict[str, Any]] = field(default_factory=dict)
+    outputs: dict[str, str] = field(default_factory=dict)
+    bib_changed: bool = False
+    citation_changed: bool = False
+    total: int = 0
+    changeset: PublicationChangeset = field(default_factory=lambda: PublicationChangeset([], [], []))
+
+
+def build_entries(run: PublicationRun) -> None:
+    selected = run.selected or []
+    for candidate, publication_key in zip(selected, run.publication_keys):
+        if candidate.dblp_key in run.reused:
+            entry = run.reused[candidate.dblp_key]
+            run.entries.append(entry)
+            run.records[candidate.dblp_key] = {"mdate": candidate.mdate, "hash": entry_hash(entry), "entry": entry}
+            continue
+
+        override = BIBTEX_OVERRIDES_BY_KEY.get(publication_key)
+        if override:
+            entry = build_publication_entry(
+                publication_key,
+                source_key=str(override.get("source", candidate.dblp_key)),
+                record=parse_bibtex_entry(str(override["bibtex"])),
+                venue=str(override.get("venue", candidate.venue)),
+                year=int(override.get("year", candidate.year)),
+                level=str(override.get("level", candidate.level)),
+                fallback_title=candidate.title,
+            )
+        else:
+            entry = build_publication_entry(
+                publication_key,
+                source_key=candidate.dblp_key,
+                record=run.fetched[candidate.dblp_key],
+                venue=candidate.venue,
+                year=candidate.year,
+                level=candidate.level,
+                fallback_title=candidate.title,
+            )
+            # A new DBLP mdate often only means a new timestamp; keep the
+            # stored entry (and so papers.bib) unless something meaningful
+            # changed.
+            previous = run.state["records"].get(candidate.dblp_key, {}).get("entry")
+            if (
+                isinstance(previous, dict)
+                and {name: value for name, value in previous.items() if name != "bibtex"}
+                == {name: value for name, value in entry.items() if name != "bibtex"}
+                and not entry_changes(previous, entry)
+            ):
+                entry = previous
+                _metrics.add("pubs.records_unchanged")
+            run.records[candidate.dblp_key] = {"mdate": candidate.mdate, "hash": entry_hash(entry), "entry": entry}
+        run.entries.append(entry)
+
+    # Merge manual publications that are not yet surfaced in DBLP selection.
+    existing_keys = {entry["key"] for entry in run.entries}
+    for manual in MANUAL_PUBLICATIONS:
+        publication_key = str(manual["key"])
+        if publication_key in existing_keys:
+            continue
+        run.entries.append(
+            build_publication_entry(
+                publication_key,
+                source_key=str(manual.get("source", publication_key)),
+                record=parse_bibtex_entry(str(manual["bibtex"])),
+                venue=str(manual["venue"]),
+                year=int(manual["year"]),
+                level=str(manual.get("level", "conference")),
+            )
+        )
+        existing_keys.add(publication_key)
+
+    run.entries.sort(key=lambda item: (item["year"], item["title"].lower()), reverse=True)
+    run.total = len(run.entries)
+    run.outputs = {entry["key"]: entry_hash(entry) for entry in run.entries}
+    previous_entries = {
+        record["entry"]["key"]: record["entry"]
+        for record in run.state["records"].values()
+        if isinstance(record.get("entry"), dict)
+    }
+    run.changeset = diff_outputs(
+        run.state["outputs"],
+        run.outputs,
+        previous_entries,
+        {entry["key"]: entry for entry in run.entries},
+    )
+
+
+def add_publication_tasks(
+    graph: TaskGraph,
+    dblp_pid: str,
+    bib_dest: Path,
+    citation_data_dest: Path,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    bulk_bibtex: bool = True,
+    state_path: Path | None = None,
+    full_sync: bool = False,
+    selected: list[DblpCandidate] | None = None,
+    prefetched_bibtex: dict[str, BibtexRecord] | None = None,
+    profile_digest: str | None = None,
+) -> PublicationRun:
+    # fetch_profile -> select -> fetch_bibtex -> process -> (write_bib |
+    # write_citations | write_state) -> record. A fingerprint hit in
+    # fetch_profile turns every later stage into a no-op.
+    run = PublicationRun(selected=selected, profile_digest=profile_digest)
+    stage = f"pubs:{dblp_pid}:{bib_dest.resolve()}"
+    output_paths = [bib_dest, citation_data_dest] + ([state_path] if state_path else [])
+
+    def fetch_profile() -> None:
+        if run.selected is None:
+            with _metrics.phase("pubs.fetch_profile"):
+                run.profile_xml = fetch_dblp_profile(dblp_pid)
+            run.profile_digest = hashlib.sha256(run.profile_xml.encode("utf-8")).hexdigest()
+        if run.profile_digest:
+            run.fingerprint = input_fingerprint("pubs", dblp_pid, run.profile_digest)
+        if run.fingerprint and not full_sync:
+            summary = lookup_stage(stage, run.fingerprint, output_paths)
+            if summary is not None:
+                run.skipped = True
+                run.total = int(summary.get("publications", 0))
+
+    def select() -> None:
+        if run.skipped:
+            return
+        if run.profile_xml is not None:
+            with _metrics.phase("pubs.select"):
+                candidates = iter_dblp_candidates(iter_text_chunks(run.profile_xml))
+                run.selected = select_highest_level_publications(candidates)
+            run.profile_xml = None
+        run.state = load_sync_state(state_path)
+        if full_sync:
+            run.state["records"] = {}
+        run.publication_keys, run.reused, run.fetch_keys = plan_publication_records(run.selected or [], run.state)
+        _metrics.add("pubs.records_reused", len(run.reused))
+        _metrics.add("pubs.records_fetched", len(run.fetch_keys))
+
+    def fetch_bibtex() -> None:
+        if run.skipped:
+            return
+        with _metrics.phase("pubs.fetch_bibtex"):
+            prefetched = prefetched_bibtex or {}
+            run.fetched = {key: prefetched[key] for key in run.fetch_keys if key in prefetched}
+            missing_keys = [key for key in run.fetch_keys if key not in run.fetched]
+            run.fetched.update(resolve_bibtex_records(dblp_pid, missing_keys, max_concurrency, bulk_bibtex))
+
+    def process() -> None:
+        if not run.skipped:
+            with _metrics.phase("pubs.process_entries"):
+                build_entries(run)
+
+    def write_bib() -> None:
+        if not run.skipped:
+            with _metrics.phase("pubs.render"):
+                run.bib_changed = write_chunks_if_changed(bib_dest, iter_bibliography(run.entries))
+
+    def write_citations() -> None:
+        if not run.skipped:
+            with _metrics.phase("pubs.render"):
+                run.citation_changed = write_chunks_if_changed(citation_data_dest, iter_citation_data(run.entries))
+
+    def write_state() -> None:
+        if not run.skipped and state_path is not None:
+            new_state = {"version": SYNC_STATE_VERSION, "records": run.records, "outputs": run.outputs}
+            encoder = json.JSONEncoder(indent=1, sort_keys=True, ensure_ascii=False)
+            write_chunks_if_changed(state_path, itertools.chain(encoder.iterencode(new_state), ("\n",)))
+
+    def record() -> None:
+        if not run.skipped and run.fingerprint:
+            record_stage(stage, run.fingerprint, output_paths, {"publications": run.total})
+
+    graph.add("pubs.fetch_profile", fetch_profile)
+    graph.add("pubs.select", select, ("pubs.fetch_profile",))
+    graph.add("pubs.fetch_bibtex", fetch_bibtex, ("pubs.select",))
+    graph.add("pubs.process", process, ("pubs.fetch_bibtex",))
+    graph.add("pubs.write_bib", write_bib, ("pubs.process",))
+    graph.add("pubs.write_citations", write_citations, ("pubs.process",))
+    graph.add("pubs.write_state", write_state, ("pubs.process",))
+    graph.add("pubs.record", record, ("pubs.write_bib", "pubs.write_citations", "pubs.write_state"))
+    return run
+
+
+def sync_publications(
+    dblp_pid: str,
+    bib_dest: Path,
+    citation_data_dest: Path,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    bulk_bibtex: bool = True,
+    state_path: Path | None = None,
+    full_sync: bool = False,
+    selected: list[DblpCandidate] | None = None,
+    prefetched_bibtex: dict[str, BibtexRecord] | None = None,
+    profile_digest: str | None = None,
+) -> tuple[bool, bool, int, PublicationChangeset]:
+    graph = TaskGraph()
+    run = add_publication_tasks(
+        graph,
+        dblp_pid,
+        bib_dest,
+        citation_data_dest,
+        max_concurrency=max_concurrency,
+        bulk_bibtex=bulk_bibtex,
+        state_path=state_path,
+        full_sync=full_sync,
+        selected=selected,
+        prefetched_bibtex=prefetched_bibtex,
+        profile_digest=profile_digest,
+    )
+    graph.run()
+    return run.bib_changed, run.citation_changed, run.total, run.changeset
@@ -0,0 +1,149 @@
+"""Per-host request admission shared by every fetch of the process."""
+
+from __future__ import annotations
+
+import email.utils
+import threading
+import time
+from dataclasses import dataclass
+
+from .config import (
+    HTTP_HOST_BURST,
+    HTTP_HOST_INITIAL_WINDOW,
+    HTTP_HOST_MAX_PAUSE_SECONDS,
+    HTTP_HOST_MAX_WINDOW,
+    HTTP_HOST_MIN_RATE,
+    HTTP_HOST_RATE,
+    HTTP_HOST_RATE_STEP,
+)
+from .metrics import _metrics
+
+# Responses that mean "slow down" rather than "this request failed".
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value: str) -> float | None:
+    # Retry-After is either delta-seconds or an HTTP date.
+    value = value.strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        deadline = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(deadline.timestamp() - time.time(), 0.0)
+
+
+@dataclass
+class HostState:
+    rate: float
+    tokens: float
+    refilled_at: float
+    window: float
+    in_flight: int = 0
+    paused_until: float = 0.0
+    # Consecutive throttled responses, for pauses without a Retry-After.
+    throttles: int = 0
+
+
+# Admission control for outgoing requests, with one state per host:
+# - token bucket: requests start at most `rate` per second (bursts of `burst`)
+# - AIMD window: at most `window` requests in flight; each success grows the
+#   window by 1/window and the rate by rate_step, a 429/503 halves both
+# - pause: a 429/503 blocks every new request to the host until Retry-After
+#   (or 1, 2, 4, ... seconds without one) has passed, so concurrent fetches
+#   back off together instead of each retrying on its own schedule
+# acquire() blocks until a request may start; every acquire() must be paired
+# with a release() that reports the response status (None for no response).
+class HostRateLimiter:
+    def __init__(
+        self,
+        rate: float = HTTP_HOST_RATE,
+        burst: float = HTTP_HOST_BURST,
+        initial_window: float = HTTP_HOST_INITIAL_WINDOW,
+        max_window: float = HTTP_HOST_MAX_WINDOW,
+        min_rate: float = HTTP_HOST_MIN_RATE,
+        rate_step: float = HTTP_HOST_RATE_STEP,
+        max_pause: float = HTTP_HOST_MAX_PAUSE_SECONDS,
+    ) -> None:
+        self.max_rate = rate
+        self.burst = burst
+        self.initial_window = initial_window
+        self.max_window = max_window
+        self.min_rate = min_rate
+        self.rate_step = rate_step
+        self.max_pause = max_pause
+        self._hosts: dict[str, HostState] = {}
+        self._condition = threading.Condition()
+
+    def _state(self, host: str, now: float) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(rate=self.max_rate, tokens=self.burst, refilled_at=now, window=self.initial_window)
+            self._hosts[host] = state
+        return state
+
+    def acquire(self, host: str) -> float:
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                state = self._state(host, now)
+                if now > state.refilled_at:
+                    state.tokens = min(self.burst, state.tokens + (now - state.refilled_at) * state.rate)
+                    state.refilled_at = now
+                if now < state.paused_until:
+                    timeout: float | None = state.paused_until - now
+                elif state.in_flight >= int(state.window):
+                    timeout = None
+                elif state.tokens < 1:
+                    timeout = (1 - state.tokens) / state.rate
+                else:
+                    state.tokens -= 1
+                    state.in_flight += 1
+                    break
+                self._condition.wait(timeout)
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            _metrics.add("http.limiter_waits")
+            _metrics.add("http.limiter_wait_seconds", waited)
+        return waited
+
+    def release(self, host: str, status: int | None, retry_after: str = "") -> None:
+        with self._condition:
+            now = time.monotonic()
+            state = self._state(host, now)
+            state.in_flight = max(state.in_flight - 1, 0)
+            if status in THROTTLE_STATUSES:
+                _metrics.add("http.throttled")
+                state.throttles += 1
+                pause = parse_retry_after(retry_after)
+                if pause is None:
+                    pause = 2 ** (state.throttles - 1)
+                pause = min(pause, self.max_pause)
+                # Requests that were in flight when the host started throttling
+                # come back throttled too; only the first one of a burst
+                # shrinks the window and the rate.
+                if now >= state.paused_until:
+                    _metrics.add("http.limiter_pauses")
+                    state.window = max(state.window / 2, 1.0)
+                    state.rate = max(state.rate / 2, self.min_rate)
+                state.paused_until = max(state.paused_until, now + pause)
+                # After the pause a single probe request may start right away;
+                # the bucket refills from there.
+                state.tokens = 1.0
+                state.refilled_at = state.paused_until
+            elif status is not None and status < 500:
+                state.throttles = 0
+                state.window = min(state.window + 1 / state.window, self.max_window)
+                state.rate = min(state.rate + self.rate_step, self.max_rate)
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._condition:
+            return {
+                host: {"window": round(state.window, 3), "rate": round(state.rate, 3)}
+                for host, state in sorted(self._hosts.items())
+            }
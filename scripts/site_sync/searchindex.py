@@ -0,0 +1,154 @@
+"""Prebuilt inverted index for filtering the publication list in the browser."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .config import SEARCH_INDEX_SHARD_MIN_TOKENS, SEARCH_INDEX_VERSION
+from .files import write_if_changed
+from .metrics import _metrics
+from .orchestrator import TaskGraph
+
+# Bit i of a posting's field mask is set when the token occurs in SEARCH_FIELDS[i].
+SEARCH_FIELDS = ("title", "author", "venue", "year")
+SEARCH_STOPWORDS = frozenset("a an and as at by for from in into is of on or the to via with".split())
+# Same steps as tokenize() in assets/js/publication-search.js: NFKD, drop
+# combining accents, lowercase, split on anything but [a-z0-9].
+COMBINING_MARKS_RE = re.compile("[\u0300-\u036f]")
+TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+SHARD_FILE_RE = re.compile(r"^shard-[a-z0-9]+\.json$")
+SEARCH_MANIFEST_NAME = "index.json"
+
+
+def tokenize(text: str) -> list[str]:
+    text = COMBINING_MARKS_RE.sub("", unicodedata.normalize("NFKD", text)).lower()
+    return [token for token in TOKEN_SPLIT_RE.split(text) if token and token not in SEARCH_STOPWORDS]
+
+
+def document_fields(citation: dict[str, Any]) -> dict[str, str]:
+    return {
+        "title": str(citation.get("title", "")),
+        "author": " ".join(citation.get("authors") or []),
+        "venue": str(citation.get("venue", "")),
+        "year": str(citation.get("year", "")),
+    }
+
+
+def build_postings(documents: list[dict[str, str]]) -> dict[str, dict[int, int]]:
+    postings: dict[str, dict[int, int]] = {}
+    for doc, fields in enumerate(documents):
+        for bit, name in enumerate(SEARCH_FIELDS):
+            for token in tokenize(fields[name]):
+                docs = postings.setdefault(token, {})
+                docs[doc] = docs.get(doc, 0) | (1 << bit)
+    return postings
+
+
+def shard_postings(postings: dict[str, dict[int, int]], shard_min_tokens: int) -> dict[str, dict[str, list[int]]]:
+    # Small indexes are one shard (""); larger ones are split by the first
+    # character of the token so a query only loads the shards of its tokens,
+    # and a prefix query never spans shards. Postings are flattened to
+    # [doc, mask, doc, mask, ...] in document order.
+    shards: dict[str, dict[str, list[int]]] = {}
+    for token in sorted(postings):
+        prefix = token[0] if len(postings) >= shard_min_tokens else ""
+        docs = postings[token]
+        shards.setdefault(prefix, {})[token] = [value for doc in sorted(docs) for value in (doc, docs[doc])]
+    return shards
+
+
+def shard_file_name(prefix: str) -> str:
+    return f"shard-{prefix or 'all'}.json"
+
+
+def load_search_manifest(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+# State of the search index stage of one task graph.
+@dataclass
+class SearchIndexRun:
+    documents: int = 0
+    tokens: int = 0
+    shards: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    rebuilt: bool = False
+    changed: bool = False
+
+
+def add_search_index_tasks(
+    graph: TaskGraph,
+    citation_data_path: Path,
+    index_dir: Path,
+    shard_min_tokens: int = SEARCH_INDEX_SHARD_MIN_TOKENS,
+    after: tuple[str, ...] = (),
+) -> SearchIndexRun:
+    # Indexes the title, authors, venue and year of every entry of the
+    # citation data into index_dir: index.json (document keys in bibliography
+    # order, field names, stopwords and shard file per token prefix) plus the
+    # shard files mapping token -> postings. index.json records a hash of the
+    # indexed fields; when it matches and every shard is on disk nothing is
+    # rebuilt, otherwise only shards whose content changed are rewritten and
+    # shards no longer listed are deleted.
+    run = SearchIndexRun()
+    manifest_path = index_dir / SEARCH_MANIFEST_NAME
+
+    def build() -> None:
+        with _metrics.phase("search.index"):
+            citations: dict[str, dict[str, Any]] = json.loads(citation_data_path.read_text(encoding="utf-8"))
+            keys = list(citations)
+            documents = [document_fields(citation) for citation in citations.values()]
+            inputs = hashlib.sha256(
+                json.dumps([SEARCH_INDEX_VERSION, shard_min_tokens, keys, documents], sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            previous = load_search_manifest(manifest_path)
+            run.documents = len(keys)
+            previous_shards = previous.get("shards") or {}
+            if previous.get("inputs") == inputs and all(
+                (index_dir / name).exists() for name in previous_shards.values()
+            ):
+                run.tokens = int(previous.get("tokens", 0))
+                run.shards = sorted(previous_shards.values())
+                _metrics.add("search.reused")
+                _metrics.add("search.tokens", run.tokens)
+                return
+            postings = build_postings(documents)
+            shards = shard_postings(postings, shard_min_tokens)
+            names = {prefix: shard_file_name(prefix) for prefix in shards}
+            for prefix, shard in shards.items():
+                if write_if_changed(index_dir / names[prefix], json.dumps(shard, separators=(",", ":")) + "\n"):
+                    run.changed = True
+            if index_dir.exists():
+                for path in sorted(index_dir.iterdir()):
+                    if SHARD_FILE_RE.match(path.name) and path.name not in names.values():
+                        path.unlink()
+                        run.removed.append(path.name)
+            manifest = {
+                "version": SEARCH_INDEX_VERSION,
+                "inputs": inputs,
+                "fields": list(SEARCH_FIELDS),
+                "stopwords": sorted(SEARCH_STOPWORDS),
+                "docs": keys,
+                "tokens": len(postings),
+                "shards": names,
+            }
+            if write_if_changed(manifest_path, json.dumps(manifest, separators=(",", ":")) + "\n"):
+                run.changed = True
+            run.tokens = len(postings)
+            run.shards = sorted(names.values())
+            run.rebuilt = True
+            _metrics.add("search.rebuilt")
+        _metrics.add("search.tokens", run.tokens)
+
+    graph.add("search.index", build, after)
+    return run
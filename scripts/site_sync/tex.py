@@ -0,0 +1,135 @@
+"""Single-pass indexing of LaTeX sections and command arguments."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+
+def strip_tex_comments(text: str) -> str:
+    return re.sub(r"(?<!\\)%.*", "", text)
+
+
+BRACKET_TOKEN_RES: dict[str, re.Pattern[str]] = {
+    "{": re.compile(r"\\[\s\S]|[{}]"),
+    "[": re.compile(r"\\[\s\S]|[\[\]]"),
+}
+
+
+def parse_bracketed(
+    text: str,
+    start: int,
+    open_ch: str,
+    close_ch: str,
+    limit: int | None = None,
+) -> tuple[str, int]:
+    end = len(text) if limit is None else limit
+    if start >= end or text[start] != open_ch:
+        raise ValueError(f"Expected '{open_ch}' at index {start}")
+    # Jump between delimiters with a regex instead of walking every character;
+    # escaped characters are consumed as a pair, as in TeX.
+    pattern = BRACKET_TOKEN_RES.get(open_ch) or re.compile(rf"\\[\s\S]|[{re.escape(open_ch + close_ch)}]")
+    depth = 0
+    for match in pattern.finditer(text, start, end):
+        token = match.group()
+        if token == open_ch:
+            depth += 1
+        elif token == close_ch:
+            depth -= 1
+            if depth == 0:
+                return text[start + 1 : match.start()], match.end()
+    raise ValueError(f"Unclosed bracket starting at {start}")
+
+
+def skip_ws(text: str, idx: int) -> int:
+    while idx < len(text) and text[idx].isspace():
+        idx += 1
+    return idx
+
+
+# Commands extracted from CV sections, with their mandatory argument counts.
+CV_COMMAND_ARITY: dict[str, int] = {"edentry": 6, "cventry": 6, "cvitem": 2}
+
+
+@dataclass(frozen=True)
+class TexCommand:
+    name: str
+    start: int
+    end: int
+    optional: str | None
+    args: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class TexSection:
+    title: str
+    start: int
+    end: int
+    commands: tuple[TexCommand, ...]
+
+    def iter_commands(self, name: str) -> list[TexCommand]:
+        return [command for command in self.commands if command.name == name]
+
+
+SECTION_HEADING_RE = re.compile(r"\\section(?![A-Za-z])")
+
+
+def find_section_headings(text: str) -> list[tuple[int, int, str]]:
+    # (heading start, body start, title) for every well-formed \section{...}.
+    headings: list[tuple[int, int, str]] = []
+    for match in SECTION_HEADING_RE.finditer(text):
+        if not text.startswith("{", match.end()):
+            continue
+        try:
+            title, body_start = parse_bracketed(text, match.end(), "{", "}")
+        except ValueError:
+            continue
+        headings.append((match.start(), body_start, title))
+    return headings
+
+
+def index_tex_sections(text: str, arity: dict[str, int] = CV_COMMAND_ARITY) -> dict[str, TexSection]:
+    # A single regex pass locates every tracked command; arguments are then
+    # read with parse_bracketed, so each character is visited once regardless
+    # of how many sections the CV has.
+    names = "|".join(re.escape(name) for name in sorted(arity, key=len, reverse=True))
+    words = [(match.start(), match.end(), match.group(1)) for match in re.finditer(rf"\\({names})(?![A-Za-z])", text)]
+    headings = find_section_headings(text)
+
+    sections: dict[str, TexSection] = {}
+    word_index = 0
+    for heading_index, (_, body_start, title) in enumerate(headings):
+        body_end = headings[heading_index + 1][0] if heading_index + 1 < len(headings) else len(text)
+        while word_index < len(words) and words[word_index][0] < body_start:
+            word_index += 1
+        commands: list[TexCommand] = []
+        # A command nested inside an earlier command of the same name is
+        # part of that command's arguments, not a separate entry.
+        resume_at: dict[str, int] = {}
+        while word_index < len(words) and words[word_index][0] < body_end:
+            pos, after, name = words[word_index]
+            word_index += 1
+            if pos < resume_at.get(name, 0):
+                continue
+            command = parse_tex_command(text, name, pos, after, arity[name], body_end)
+            resume_at[name] = command.end
+            commands.append(command)
+        if title not in sections:
+            sections[title] = TexSection(title=title, start=body_start, end=body_end, commands=tuple(commands))
+    return sections
+
+
+def parse_tex_command(text: str, name: str, start: int, after: int, arg_count: int, limit: int) -> TexCommand:
+    cursor = skip_ws(text, after)
+    optional: str | None = None
+    if cursor < limit and text[cursor] == "[":
+        optional, cursor = parse_bracketed(text, cursor, "[", "]", limit)
+        cursor = skip_ws(text, cursor)
+    args: list[str] = []
+    for _ in range(arg_count):
+        cursor = skip_ws(text, cursor)
+        if cursor >= limit or text[cursor] != "{":
+            break
+        arg, cursor = parse_bracketed(text, cursor, "{", "}", limit)
+        args.append(arg)
+    return TexCommand(name=name, start=start, end=cursor, optional=optional, args=tuple(args))
@@ -0,0 +1,152 @@
+"""Reader for the YAML subset used by the site's hand-written _data files."""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+YAML_KEY_RE = re.compile(r"""^("(?:[^"\\]|\\.)*"|'(?:[^']|'')*'|[^\s"'#][^:#]*?)\s*:(?:\s+(.*))?$""")
+YAML_INT_RE = re.compile(r"^[-+]?\d+$")
+BLOCK_SCALAR_HEADERS = {"|", "|-", "|+", ">", ">-", ">+"}
+
+
+def parse_yaml_scalar(raw: str, where: str) -> Any:
+    if raw.startswith('"'):
+        end = re.match(r'"(?:[^"\\]|\\.)*"', raw)
+        if end is None:
+            raise ValueError(f"{where}: unterminated double-quoted scalar")
+        return json.loads(end.group(0))
+    if raw.startswith("'"):
+        end = re.match(r"'(?:[^']|'')*'", raw)
+        if end is None:
+            raise ValueError(f"{where}: unterminated single-quoted scalar")
+        return end.group(0)[1:-1].replace("''", "'")
+    value = re.sub(r"\s+#.*$", "", raw).strip()
+    if value == "[]":
+        return []
+    if value == "{}":
+        return {}
+    if value[:1] in {"[", "{", "&", "*", "!", "|", ">"}:
+        raise ValueError(f"{where}: unsupported YAML value: {value}")
+    if value in {"", "~", "null"}:
+        return None
+    if value in {"true", "false"}:
+        return value == "true"
+    if YAML_INT_RE.match(value):
+        return int(value)
+    return value
+
+
+# Block mappings, block sequences (including "- key: value" items), plain,
+# quoted and block (| and >) scalars, and [] / {} for empty collections:
+# enough for files like _data/publication_meta.yml without a YAML dependency.
+# Anything else (flow collections, anchors, tags) raises ValueError.
+class YamlSubsetParser:
+    def __init__(self, text: str, source: str = "<yaml>") -> None:
+        self.lines = text.splitlines()
+        self.source = source
+        self.pos = 0
+
+    def where(self) -> str:
+        return f"{self.source}:{self.pos + 1}"
+
+    def peek(self) -> tuple[int, str] | None:
+        while self.pos < len(self.lines):
+            line = self.lines[self.pos]
+            stripped = line.strip()
+            if stripped and not stripped.startswith("#") and stripped != "---":
+                if "\t" in line[: len(line) - len(line.lstrip())]:
+                    raise ValueError(f"{self.where()}: tabs are not allowed in indentation")
+                return len(line) - len(line.lstrip(" ")), stripped
+            self.pos += 1
+        return None
+
+    def parse(self) -> Any:
+        head = self.peek()
+        if head is None:
+            return None
+        value = self.parse_block(head[0])
+        if self.peek() is not None:
+            raise ValueError(f"{self.where()}: unexpected indentation")
+        return value
+
+    def parse_block(self, indent: int) -> Any:
+        head = self.peek()
+        if head is not None and (head[1] == "-" or head[1].startswith("- ")):
+            return self.parse_sequence(indent)
+        return self.parse_mapping(indent)
+
+    def parse_mapping(self, indent: int) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        while (head := self.peek()) is not None and head[0] == indent and not head[1].startswith("- "):
+            match = YAML_KEY_RE.match(head[1])
+            if match is None:
+                raise ValueError(f"{self.where()}: expected 'key: value'")
+            key = parse_yaml_scalar(match.group(1), self.where())
+            self.pos += 1
+            result[str(key)] = self.parse_value(match.group(2) or "", indent)
+        return result
+
+    def parse_sequence(self, indent: int) -> list[Any]:
+        items: list[Any] = []
+        while (head := self.peek()) is not None and head[0] == indent and (head[1] == "-" or head[1].startswith("- ")):
+            rest = head[1][1:].strip()
+            if not rest:
+                self.pos += 1
+                items.append(self.parse_value("", indent))
+            elif YAML_KEY_RE.match(rest):
+                # "- key: value" opens a mapping indented to the item's text.
+                item_indent = indent + len(head[1]) - len(rest)
+                self.lines[self.pos] = " " * item_indent + rest
+                items.append(self.parse_mapping(item_indent))
+            else:
+                self.pos += 1
+                items.append(self.parse_value(rest, indent))
+        return items
+
+    def parse_value(self, raw: str, indent: int) -> Any:
+        if raw in BLOCK_SCALAR_HEADERS:
+            return self.parse_block_scalar(raw, indent)
+        if raw and not raw.startswith("#"):
+            return parse_yaml_scalar(raw, self.where())
+        head = self.peek()
+        if head is not None and (head[0] > indent or (head[0] == indent and head[1].startswith("- "))):
+            return self.parse_block(head[0])
+        return None
+
+    def parse_block_scalar(self, header: str, indent: int) -> str:
+        lines: list[str] = []
+        block_indent: int | None = None
+        while self.pos < len(self.lines):
+            line = self.lines[self.pos]
+            if line.strip():
+                line_indent = len(line) - len(line.lstrip(" "))
+                if line_indent <= indent:
+                    break
+                block_indent = line_indent if block_indent is None else block_indent
+                lines.append(line[block_indent:])
+            else:
+                lines.append("")
+            self.pos += 1
+        while lines and not lines[-1]:
+            lines.pop()
+        if header.startswith("|"):
+            text = "\n".join(lines)
+        else:
+            # Folding: single line breaks become spaces, blank lines stay breaks.
+            text = ""
+            for index, line in enumerate(lines):
+                if index and line and lines[index - 1]:
+                    text += " "
+                elif index:
+                    text += "\n"
+                text += line
+        if header.endswith("-") or not text:
+            return text
+        return text + "\n"
+
+
+def load_yaml(path: Path) -> Any:
+    return YamlSubsetParser(path.read_text(encoding="utf-8"), str(path)).parse()